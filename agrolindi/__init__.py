@@ -0,0 +1 @@
+# AGROLINDI RH - logjika e dyqanit, e ndarë nga ndërfaqja Streamlit
@@ -0,0 +1,305 @@
+import json
+import os
+import threading
+import time
+from datetime import date
+
+import numpy as np
+
+from agrolindi.products import get_repository
+from agrolindi.storage import DATA_DIR, add_write_listener, get_backend, local_version
+
+# --- ANALITIKA (SNAPSHOT KOLONOR) ---
+# Shitjet mbahen si kolona NumPy të tipizuara: një tabelë për faturat
+# (headers) dhe një për rreshtat e shitjes (lines). Snapshot-i ruhet në
+# data/analytics/ dhe rifreskohet vetëm me shitjet e shtuara pas seq-it
+# të fundit, kështu që pyetjet janë vektoriale dhe s'prekin JSON-in bruto.
+
+SNAPSHOT_DIR = os.path.join(DATA_DIR, "analytics")
+# Sa rreshta të rinj lejohen në memorie para se snapshot-i të rishkruhet në disk
+PERSIST_EVERY = 500
+RECHECK_SECONDS = 2.0
+
+_EPOCH = date(1970, 1, 1).toordinal()
+
+HEADER_COLUMNS = {"seq": np.int64, "day": np.int32, "total": np.float64, "cogs": np.float64, "type": np.int16}
+LINE_COLUMNS = {"seq": np.int64, "day": np.int32, "product": np.int32, "category": np.int32,
+                "quantity": np.float64, "revenue": np.float64, "cost": np.float64}
+
+
+def day_number(iso):
+    return date.fromisoformat(iso[:10]).toordinal() - _EPOCH
+
+
+def day_iso(n):
+    return date.fromordinal(int(n) + _EPOCH).isoformat()
+
+
+class Table:
+    # Kolona NumPy me kapacitet që dyfishohet, që shtimi të jetë O(1) mesatarisht
+    def __init__(self, columns, arrays=None):
+        self.columns = columns
+        self.n = 0
+        self.data = {c: np.empty(0, dtype=t) for c, t in columns.items()}
+        if arrays is not None:
+            self.append(arrays)
+
+    def append(self, values):
+        count = len(next(iter(values.values())))
+        if count == 0:
+            return
+        need = self.n + count
+        cap = len(next(iter(self.data.values())))
+        if need > cap:
+            cap = max(need, cap * 2, 1024)
+            for c, t in self.columns.items():
+                grown = np.empty(cap, dtype=t)
+                grown[:self.n] = self.data[c][:self.n]
+                self.data[c] = grown
+        for c, t in self.columns.items():
+            self.data[c][self.n:need] = np.asarray(values[c], dtype=t)
+        self.n = need
+
+    def __getitem__(self, column):
+        return self.data[column][:self.n]
+
+    def arrays(self):
+        return {c: self[c] for c in self.columns}
+
+    def view(self):
+        # Të gjitha kolonat me të njëjtin n. add_sales (nën bravë) mund të zgjerojë
+        # tabelën gjatë një pyetjeje; rreshtat [:n] s'ndryshojnë më, ndaj pyetjet
+        # lexojnë nga pamja, jo nga tabela
+        n = self.n
+        return {c: a[:n] for c, a in list(self.data.items())}
+
+
+class Snapshot:
+    def __init__(self):
+        self.headers = Table(HEADER_COLUMNS)
+        self.lines = Table(LINE_COLUMNS)
+        # Fjalorët: kodi numerik -> vlera tekst
+        self.products = []
+        self.categories = []
+        self.types = []
+        self._codes = {"products": {}, "categories": {}, "types": {}}
+        self.last_seq = 0
+        self.generation = 0
+        self.local_version = -1
+        self.checked_at = 0.0
+        self.unsaved = 0
+
+    def code(self, kind, value):
+        codes = self._codes[kind]
+        c = codes.get(value)
+        if c is None:
+            c = codes[value] = len(codes)
+            getattr(self, kind).append(value)
+        return c
+
+    def add_sales(self, rows):
+        repo = get_repository()
+        h = {c: [] for c in HEADER_COLUMNS}
+        ln = {c: [] for c in LINE_COLUMNS}
+        for seq, sale in rows:
+            day = day_number(sale['date'])
+            h["seq"].append(seq)
+            h["day"].append(day)
+            h["total"].append(sale['total'])
+            h["type"].append(self.code("types", sale.get('type', 'cash')))
+            sale_cogs = 0.0
+            for item in sale['items']:
+                prod = repo.get(item['product_id'])
+                cost = item.get('cost')
+                if cost is None:
+                    # Shitje e vjetër pa COGS: çmimi aktual i blerjes
+                    cost = (prod.get('purchasePrice', 0) if prod else 0) * item['quantity']
+                sale_cogs += cost
+                ln["seq"].append(seq)
+                ln["day"].append(day)
+                ln["product"].append(self.code("products", item['product_id']))
+                ln["category"].append(self.code("categories", prod.get('category', '') if prod else ''))
+                ln["quantity"].append(item['quantity'])
+                ln["revenue"].append(item.get('total', item['price'] * item['quantity']))
+                ln["cost"].append(cost)
+            h["cogs"].append(sale['cogs'] if sale.get('cogs') is not None else sale_cogs)
+            self.last_seq = seq
+        self.headers.append(h)
+        self.lines.append(ln)
+        self.unsaved += len(rows)
+
+    # --- Ruajtja në disk ---
+    def save(self, directory=SNAPSHOT_DIR):
+        os.makedirs(directory, exist_ok=True)
+        # Skedarë të përkohshëm për proces/fije: aplikacioni dhe cron-i mund ta ruajnë njëkohësisht
+        suffix = f"{os.getpid()}.{threading.get_ident()}"
+        for name, table in (("headers", self.headers), ("lines", self.lines)):
+            tmp = os.path.join(directory, f"{name}.{suffix}.tmp.npz")
+            np.savez(tmp, generation=self.generation, **table.arrays())
+            os.replace(tmp, os.path.join(directory, f"{name}.npz"))
+        meta = {"last_seq": self.last_seq, "generation": self.generation, "products": self.products,
+                "categories": self.categories, "types": self.types}
+        tmp = os.path.join(directory, f"meta.{suffix}.tmp.json")
+        with open(tmp, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(directory, "meta.json"))
+        self.unsaved = 0
+
+    @classmethod
+    def load(cls, directory=SNAPSHOT_DIR):
+        # Tre skedarët zëvendësohen më vete: një ndërprerje ose dy shkrues mund t'i
+        # lënë të papërputhur. Kolonat priten në seq-in e fundit të përbashkët dhe
+        # load_since shton pjesën tjetër; gjeneratë e ndryshme = rindërtim
+        snap = cls()
+        try:
+            with open(os.path.join(directory, "meta.json")) as f:
+                meta = json.load(f)
+            with np.load(os.path.join(directory, "headers.npz")) as z:
+                headers = {c: z[c] for c in HEADER_COLUMNS}
+                generations = {int(z["generation"])}
+            with np.load(os.path.join(directory, "lines.npz")) as z:
+                lines = {c: z[c] for c in LINE_COLUMNS}
+                generations.add(int(z["generation"]))
+        except (FileNotFoundError, KeyError, ValueError):
+            return None
+        if generations != {meta["generation"]}:
+            return None
+        last_seq = min(int(t["seq"][-1]) if len(t["seq"]) else 0 for t in (headers, lines))
+        headers = {c: a[headers["seq"] <= last_seq] for c, a in headers.items()}
+        lines = {c: a[lines["seq"] <= last_seq] for c, a in lines.items()}
+        # Kode që meta.json s'i njeh (meta më e vjetër se kolonat)
+        for kind, codes in (("types", headers["type"]), ("products", lines["product"]),
+                            ("categories", lines["category"])):
+            if len(codes) and codes.max() >= len(meta[kind]):
+                return None
+        snap.headers.append(headers)
+        snap.lines.append(lines)
+        snap.last_seq = last_seq
+        snap.generation = meta["generation"]
+        for kind in ("products", "categories", "types"):
+            for value in meta[kind]:
+                snap.code(kind, value)
+        return snap
+
+    # --- Pyetjet vektoriale ---
+    def _mask(self, table, start=None, end=None):
+        day = table["day"]
+        mask = np.ones(len(day), dtype=bool)
+        if start:
+            mask &= day >= day_number(start)
+        if end:
+            mask &= day < day_number(end)
+        return mask
+
+    def summary(self, start=None, end=None):
+        headers = self.headers.view()
+        m = self._mask(headers, start, end)
+        revenue = float(headers["total"][m].sum())
+        cogs = float(headers["cogs"][m].sum())
+        return {
+            "orders": int(m.sum()),
+            "revenue": revenue,
+            "cogs": cogs,
+            "profit": revenue - cogs,
+            "margin": (revenue - cogs) / revenue if revenue else 0.0,
+        }
+
+    def daily_totals(self, start=None, end=None):
+        headers = self.headers.view()
+        m = self._mask(headers, start, end)
+        days = headers["day"][m]
+        if len(days) == 0:
+            return {"date": [], "total": []}
+        base = days.min()
+        totals = np.bincount(days - base, weights=headers["total"][m])
+        present = np.nonzero(np.bincount(days - base))[0]
+        return {"date": [day_iso(base + d) for d in present], "total": totals[present].tolist()}
+
+    def category_mix(self, start=None, end=None):
+        lines = self.lines.view()
+        m = self._mask(lines, start, end)
+        codes = lines["category"][m]
+        size = len(self.categories)
+        revenue = np.bincount(codes, weights=lines["revenue"][m], minlength=size)
+        cost = np.bincount(codes, weights=lines["cost"][m], minlength=size)
+        quantity = np.bincount(codes, weights=lines["quantity"][m], minlength=size)
+        present = np.nonzero(quantity)[0]
+        order = present[np.argsort(-revenue[present])]
+        return {
+            "category": [self.categories[i] for i in order],
+            "revenue": revenue[order].tolist(),
+            "cost": cost[order].tolist(),
+            "margin": ((revenue[order] - cost[order]) / np.where(revenue[order] == 0, 1, revenue[order])).tolist(),
+            "quantity": quantity[order].tolist(),
+        }
+
+    def top_products(self, n=5, start=None, end=None, by="quantity"):
+        lines = self.lines.view()
+        m = self._mask(lines, start, end)
+        codes = lines["product"][m]
+        size = len(self.products)
+        quantity = np.bincount(codes, weights=lines["quantity"][m], minlength=size)
+        revenue = np.bincount(codes, weights=lines["revenue"][m], minlength=size)
+        cost = np.bincount(codes, weights=lines["cost"][m], minlength=size)
+        key = quantity if by == "quantity" else revenue
+        present = np.nonzero(quantity)[0]
+        top = present[np.argsort(-key[present], kind="stable")][:n]
+        return {
+            "product_id": [self.products[i] for i in top],
+            "quantity": quantity[top].tolist(),
+            "revenue": revenue[top].tolist(),
+            "profit": (revenue[top] - cost[top]).tolist(),
+        }
+
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+_needs_rebuild = False
+
+
+def _rebuild(backend):
+    snap = Snapshot()
+    snap.generation = backend.generation("sales")
+    snap.add_sales(backend.load_since("sales", 0))
+    snap.save()
+    return snap
+
+
+def get_snapshot():
+    # Kthen snapshot-in e freskët; lexon nga backend-i vetëm shitjet e reja
+    global _snapshot, _needs_rebuild
+    with _snapshot_lock:
+        version = local_version("sales")
+        now = time.monotonic()
+        if _snapshot is not None and _snapshot.local_version == version and now - _snapshot.checked_at < RECHECK_SECONDS:
+            return _snapshot
+        backend = get_backend()
+        if _snapshot is None:
+            _snapshot = Snapshot.load()
+        if _snapshot is None or _needs_rebuild or _snapshot.generation != backend.generation("sales"):
+            _needs_rebuild = False
+            _snapshot = _rebuild(backend)
+        rows = backend.load_since("sales", _snapshot.last_seq)
+        if rows:
+            _snapshot.add_sales(rows)
+            if _snapshot.unsaved >= PERSIST_EVERY:
+                _snapshot.save()
+        _snapshot.local_version = version
+        _snapshot.checked_at = now
+        return _snapshot
+
+
+def _on_write(key, records):
+    global _needs_rebuild
+    if key == "sales" and records is None:
+        # Shitjet u rishkruan të tëra: snapshot-i rindërtohet herën tjetër
+        _needs_rebuild = True
+
+
+add_write_listener(_on_write)
+
+
+if __name__ == "__main__":
+    # python -m agrolindi.analytics  -> rindërton snapshot-in kolonor
+    snap = _rebuild(get_backend())
+    print(f"{snap.headers.n} fatura, {snap.lines.n} rreshta")
@@ -0,0 +1,191 @@
+import json
+import os
+import re
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from agrolindi import metrics, service
+from agrolindi.products import get_repository
+from agrolindi.storage import get_backend
+
+# --- API HTTP LOKALE (SKANERË, ARKA TË TJERA) ---
+# python -m agrolindi.api --port 8765
+# Server me një fije për kërkesë mbi shërbimet e dyqanit, pa Streamlit. Çdo
+# shitje është një transaksion (njësoj si kasa); /sales/batch shkruan shumë
+# shporta me një commit. Dëgjon vetëm në 127.0.0.1 si parazgjedhje; me
+# AGROLINDI_API_TOKEN kërkohet "Authorization: Bearer <token>".
+#
+#   GET  /health
+#   GET  /products?q=npk&limit=20&in_stock=1
+#   GET  /products/<id>          GET /barcode/<kodi>
+#   POST /sales                  {"items": [{"barcode": "...", "quantity": 2}], "debtor_name": "..."}
+#   POST /sales/batch            {"carts": [{"items": [...]}, ...]}
+#   POST /supplies               {"supplier", "item_name", "category", "quantity", "purchase_price", "selling_price"}
+#   POST /debts/<id>/payments    {"amount": 10}
+
+HOST = os.environ.get("AGROLINDI_API_HOST", "127.0.0.1")
+PORT = int(os.environ.get("AGROLINDI_API_PORT", "8765"))
+TOKEN = os.environ.get("AGROLINDI_API_TOKEN", "")
+MAX_BODY = 1024 * 1024
+MAX_BATCH = 500
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _product(p):
+    if p is None:
+        raise ApiError(404, "Produkti nuk u gjet")
+    return service.product_info(p)
+
+
+def health(params, body):
+    return {"ok": True, "storage": get_backend().name}
+
+
+def products(params, body):
+    limit = min(200, max(1, int(params.get("limit", "20"))))
+    found, total = service.search_products(params.get("q", ""), limit, params.get("in_stock") == "1")
+    return {"products": found, "total": total}
+
+
+def product(params, body, product_id):
+    return _product(get_repository().get(product_id))
+
+
+def barcode(params, body, code):
+    return _product(get_repository().find_by_barcode(code))
+
+
+def sale(params, body):
+    return service.sell(body)
+
+
+def sale_batch(params, body):
+    carts = body.get("carts")
+    if not isinstance(carts, list) or not carts or len(carts) > MAX_BATCH:
+        raise ApiError(400, f"'carts' duhet të jetë listë me 1-{MAX_BATCH} shporta")
+    results = service.sell_batch([c if isinstance(c, dict) else {} for c in carts])
+    return {"results": [{"ok": True, "sale": s} if s else {"ok": False, "error": e} for s, e in results],
+            "sold": sum(1 for s, _ in results if s)}
+
+
+def supply(params, body):
+    return service.receive(body)
+
+
+def payment(params, body, debt_id):
+    return service.pay_debt(debt_id, body.get("amount"))
+
+
+# (metoda, shprehja e rrugës, funksioni); grupet e shprehjes kalojnë si argumente
+ROUTES = [
+    ("GET", r"/health", health),
+    ("GET", r"/products", products),
+    ("GET", r"/products/([^/]+)", product),
+    ("GET", r"/barcode/([^/]+)", barcode),
+    ("POST", r"/sales", sale),
+    ("POST", r"/sales/batch", sale_batch),
+    ("POST", r"/supplies", supply),
+    ("POST", r"/debts/([^/]+)/payments", payment),
+]
+ROUTES = [(method, re.compile(pattern + "$"), fn) for method, pattern, fn in ROUTES]
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # lidhje keep-alive për skanerët
+    # Kokat dhe trupi shkruhen veç: pa këtë, Nagle + ACK i vonuar shtojnë ~40 ms për përgjigje
+    disable_nagle_algorithm = True
+    quiet = True
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def dispatch(self, method):
+        url = urlparse(self.path)
+        self.body_read = False
+        try:
+            if TOKEN and self.headers.get("Authorization") != f"Bearer {TOKEN}":
+                raise ApiError(401, "Mungon autorizimi")
+            body = self.read_body() if method == "POST" else {}
+            for route_method, pattern, fn in ROUTES:
+                match = pattern.match(url.path)
+                if match and route_method == method:
+                    params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                    with metrics.span(f"api_{fn.__name__}"):
+                        result = fn(params, body, *match.groups())
+                    self.reply(200, result)
+                    return
+            raise ApiError(404, "Rrugë e panjohur")
+        except ApiError as e:
+            self.reply(e.status, {"error": str(e)})
+        except ValueError as e:
+            # Gabimet e biznesit (stoku, sasia, borxhi) nga shërbimet
+            self.reply(422, {"error": str(e)})
+        except Exception as e:
+            self.reply(500, {"error": f"{type(e).__name__}: {e}"})
+            raise
+
+    def read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY:
+            raise ApiError(413, "Kërkesa është shumë e madhe")
+        data = self.rfile.read(length)
+        self.body_read = True
+        try:
+            body = json.loads(data or b"{}")
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            raise ApiError(400, "JSON i pavlefshëm")
+        if not isinstance(body, dict):
+            raise ApiError(400, "Trupi duhet të jetë objekt JSON")
+        return body
+
+    def reply(self, status, payload):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        if self.command == "POST" and not self.body_read:
+            # Gabim para leximit të trupit (401, 413): trupi i mbetur do të lexohej si
+            # kërkesa tjetër e lidhjes keep-alive, ndaj lidhja mbyllet
+            self.close_connection = True
+            self.send_header("Connection", "close")
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(host=HOST, port=PORT, quiet=True):
+    Handler.quiet = quiet
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT, help="0 = port i lirë")
+    parser.add_argument("--verbose", action="store_true", help="shkruaj çdo kërkesë")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, quiet=not args.verbose)
+    host, port = server.server_address[:2]
+    print(f"API e AGROLINDI në http://{host}:{port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
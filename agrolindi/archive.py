@@ -0,0 +1,194 @@
+import gzip
+import json
+import os
+from datetime import date
+
+from agrolindi.periods import month_range
+from agrolindi.products import get_repository
+from agrolindi.rollups import _merge, sale_contributions
+from agrolindi.storage import DATA_DIR, list_periods, load_data, query_range, run_transaction
+
+# --- MBYLLJA E PERIUDHAVE (ARKIVI) ---
+# Një muaj i mbyllur del nga të dhënat e punës: shitjet, furnizimet dhe
+# borxhet e paguara shkruhen në një segment të kompresuar
+# (data/archive/YYYY-MM.json.gz) dhe në koleksionin "periods" mbetet vetëm
+# përmbledhja e tij (totalet ditore, COGS, kategoritë, bilanci i borxheve).
+# Raportet i kombinojnë këto përmbledhje me të dhënat e gjalla pa hapur arkivin.
+
+ARCHIVE_DIR = os.path.join(DATA_DIR, "archive")
+# Sa muaj para muajit aktual mbeten të hapur (dritaret 30-ditore të analitikës)
+KEEP_MONTHS = 1
+
+
+def segment_path(period, directory=ARCHIVE_DIR):
+    return os.path.join(directory, f"{period}.json.gz")
+
+
+def read_segment(period, directory=ARCHIVE_DIR):
+    try:
+        with gzip.open(segment_path(period, directory), "rt", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"period": period, "sales": [], "supplies": [], "debts": []}
+
+
+def _write_segment(segment, directory=ARCHIVE_DIR):
+    os.makedirs(directory, exist_ok=True)
+    path = segment_path(segment["period"], directory)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with gzip.open(tmp, "wt", encoding="utf-8") as f:
+        json.dump(segment, f)
+    os.replace(tmp, path)
+
+
+def _merge_records(old, new):
+    # Mbyllja e përsëritur (p.sh. shitje e regjistruar me vonesë) s'dyfishon asgjë
+    by_id = {r['id']: r for r in old}
+    by_id.update((r['id'], r) for r in new)
+    return list(by_id.values())
+
+
+def _day(days, iso):
+    return days.setdefault(iso[:10], {"orders": 0, "revenue": 0.0, "cogs": 0.0,
+                                       "supply_cost": 0.0, "categories": {}})
+
+
+def summarize(segment, outstanding):
+    repo = get_repository()
+
+    def category_of(product_id):
+        p = repo.get(product_id)
+        return p.get('category', '') if p else ''
+
+    days = {}
+    rollups = {}
+    for sale in segment["sales"]:
+        d = _day(days, sale['date'])
+        d["orders"] += 1
+        d["revenue"] += sale['total']
+        d["cogs"] += sale.get('cogs') or 0.0
+        for item in sale['items']:
+            row = d["categories"].setdefault(category_of(item['product_id']), [0.0, 0.0, 0])
+            row[0] += item.get('total', item['price'] * item['quantity'])
+            row[1] += item.get('cost') or 0.0
+            row[2] += item['quantity']
+        for rid, delta in sale_contributions(sale, category_of).items():
+            if rid in rollups:
+                _merge(rollups[rid], delta)
+            else:
+                rollups[rid] = delta
+    # Dërgesat sipas furnizuesit dhe furnizuesi i fundit i çdo artikulli, për
+    # kohën e furnizimit në parashikim
+    deliveries = {}
+    last_supplier = {}
+    for supply in sorted(segment["supplies"], key=lambda s: s['date']):
+        _day(days, supply['date'])["supply_cost"] += supply['purchasePrice'] * supply['quantity']
+        deliveries.setdefault(supply['supplier'], set()).add(supply['date'][:10])
+        last_supplier[supply['itemName']] = supply['supplier']
+
+    revenue = sum(d["revenue"] for d in days.values())
+    cogs = sum(d["cogs"] for d in days.values())
+    return {
+        "id": segment["period"],
+        "closedAt": date.today().isoformat(),
+        "orders": sum(d["orders"] for d in days.values()),
+        "revenue": revenue,
+        "cogs": cogs,
+        "profit": revenue - cogs,
+        "supplyCost": sum(d["supply_cost"] for d in days.values()),
+        "paidDebts": len(segment["debts"]),
+        "outstanding": outstanding,
+        "days": days,
+        "rollups": rollups,
+        "deliveries": {supplier: sorted(d) for supplier, d in deliveries.items()},
+        "lastSupplier": last_supplier,
+    }
+
+
+def close_period(period, directory=ARCHIVE_DIR):
+    # Mbyll një muaj (YYYY-MM); kthen përmbledhjen ose None kur s'ka çfarë të arkivohet
+    start, end = month_range(date.fromisoformat(f"{period}-01"))
+    sales = query_range("sales", start, end)
+    supplies = query_range("supplies", start, end)
+    debts = load_data("debts", [])
+    paid = [d for d in debts if d.get('isPaid') and d.get('dateTaken', '') < end]
+    if not sales and not supplies and not paid:
+        return None
+    # Bilanci i borxheve të hapura në mbyllje
+    unpaid = [d for d in debts if not d.get('isPaid') and d.get('dateTaken', '') < end]
+    outstanding = {"count": len(unpaid), "amount": sum(d['amount'] for d in unpaid)}
+
+    segment = read_segment(period, directory)
+    segment["sales"] = _merge_records(segment["sales"], sales)
+    segment["supplies"] = _merge_records(segment["supplies"], supplies)
+    segment["debts"] = _merge_records(segment["debts"], paid)
+    summary = summarize(segment, outstanding)
+    # Segmenti shkruhet para se të fshihet gjë: në rast ndërprerjeje, mbyllja thjesht përsëritet
+    _write_segment(segment, directory)
+
+    def apply(tx):
+        tx.update("periods", summary)
+        for key, records in (("sales", sales), ("supplies", supplies), ("debts", paid)):
+            for r in records:
+                tx.delete(key, r['id'])
+
+    run_transaction(apply)
+    return summary
+
+
+def due_periods(today=None, keep=KEEP_MONTHS):
+    # Muajt para muajit aktual - keep që kanë ende të dhëna të gjalla
+    today = today or date.today()
+    month = today.year * 12 + today.month - 1 - keep
+    cutoff = f"{month // 12:04d}-{month % 12 + 1:02d}"
+    periods = set(list_periods("sales")) | set(list_periods("supplies"))
+    return sorted(p for p in periods if p < cutoff)
+
+
+def close_due_periods(today=None, keep=KEEP_MONTHS, directory=ARCHIVE_DIR):
+    closed = []
+    for period in due_periods(today, keep):
+        summary = close_period(period, directory)
+        if summary is not None:
+            closed.append(summary)
+    return closed
+
+
+# --- RAPORTET MBI PERIUDHAT E MBYLLURA ---
+def closed_between(start, end):
+    # Totalet e ditëve të arkivuara në [start, end), vetëm nga përmbledhjet
+    result = {"orders": 0, "revenue": 0.0, "cogs": 0.0, "supply_cost": 0.0, "categories": {}}
+    for period in load_data("periods", []):
+        if period['id'] < start[:7] or period['id'] > end[:7]:
+            continue
+        for day, d in period["days"].items():
+            if not start <= day < end:
+                continue
+            result["orders"] += d["orders"]
+            result["revenue"] += d["revenue"]
+            result["cogs"] += d["cogs"]
+            result["supply_cost"] += d["supply_cost"]
+            for category, (revenue, cost, quantity) in d["categories"].items():
+                row = result["categories"].setdefault(category, [0.0, 0.0, 0])
+                row[0] += revenue
+                row[1] += cost
+                row[2] += quantity
+    return result
+
+
+if __name__ == "__main__":
+    # python -m agrolindi.archive [--keep 1] [YYYY-MM ...]  -> mbyll periudhat
+    import sys
+
+    args = sys.argv[1:]
+    keep = KEEP_MONTHS
+    if "--keep" in args:
+        i = args.index("--keep")
+        keep = int(args[i + 1])
+        del args[i:i + 2]
+    results = [close_period(p) for p in args] if args else close_due_periods(keep=keep)
+    for s in filter(None, results):
+        print(f"{s['id']}: {s['orders']} fatura, {s['revenue']:.2f}€, COGS {s['cogs']:.2f}€, "
+              f"{s['paidDebts']} borxhe të paguara; borxh i hapur {s['outstanding']['amount']:.2f}€")
+    if not any(results):
+        print("Asnjë periudhë për t'u mbyllur.")
@@ -0,0 +1,150 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from agrolindi import metrics
+from agrolindi.context import context_builder
+from agrolindi.storage import get_backend, local_version
+
+# --- ASISTENTI AI ---
+# Përgjigjet transmetohen (streaming) ndërsa vijnë nga modeli dhe ruhen në
+# një cache LRU me TTL, me çelës prompt-in e plotë (konteksti + pyetja) dhe
+# versionin e të dhënave. Modeli GenerativeModel krijohet një herë për çelës
+# API dhe ripërdoret.
+
+MODEL_NAME = "gemini-pro"
+DATA_KEYS = ("products", "sales", "supplies", "debts", "forecast")
+
+
+def data_version():
+    # Ndryshon sapo ndryshon ndonjë koleksion që hyn në kontekst, edhe nga procese të tjera
+    backend = get_backend()
+    return tuple((local_version(key), backend.stored_version(key)) for key in DATA_KEYS)
+
+
+class GeminiBackend:
+    name = "gemini"
+
+    def __init__(self, api_key, model_name=MODEL_NAME):
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(model_name)
+
+    def stream(self, prompt):
+        for chunk in self.model.generate_content(prompt, stream=True):
+            if chunk.text:
+                yield chunk.text
+
+
+class StubBackend:
+    # Model lokal pa rrjet: për prova vonese dhe cache-i pa thirrje API
+    name = "stub"
+
+    def __init__(self, first_token_delay=0.3, token_delay=0.02):
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+        self.calls = 0
+
+    def stream(self, prompt):
+        self.calls += 1
+        question = prompt.rsplit("User:", 1)[-1].replace("AI:", "").strip()
+        answer = (f"(Model lokal) Pyetja juaj: \"{question}\". "
+                  f"Konteksti ka {len(prompt)} karaktere; lidhuni me Gemini për përgjigje të vërtetë.")
+        time.sleep(self.first_token_delay)
+        for word in answer.split(" "):
+            yield word + " "
+            time.sleep(self.token_delay)
+
+
+class ResponseCache:
+    def __init__(self, max_entries=256, ttl=3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # çelësi -> (koha, teksti)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(prompt, version):
+        return hashlib.sha256(f"{version}\n{prompt.strip().lower()}".encode()).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, text):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), text)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses,
+                    "hit_rate": self.hits / total if total else 0.0}
+
+
+class Assistant:
+    def __init__(self, backend, cache=None):
+        self.backend = backend
+        self.cache = cache if cache is not None else ResponseCache()
+        self.last_latency = None  # sekonda deri te pjesa e parë e përgjigjes
+
+    @metrics.instrument("ai_answer")
+    def ask(self, question, context, version=None):
+        # Gjenerator: kthen copat e përgjigjes sapo vijnë
+        started = time.perf_counter()
+        full_prompt = f"{context}\nUser: {question}\nAI:"
+        # Konteksti është pjesë e çelësit: të dhëna të reja japin prompt tjetër
+        key = ResponseCache.key(full_prompt, (self.backend.name, version))
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.last_latency = time.perf_counter() - started
+            yield cached
+            return
+        parts = []
+        for chunk in self.backend.stream(full_prompt):
+            if not parts:
+                self.last_latency = time.perf_counter() - started
+            parts.append(chunk)
+            yield chunk
+        # Ruhet vetëm përgjigja e plotë (jo ajo e ndërprerë nga një gabim)
+        self.cache.put(key, "".join(parts))
+
+
+response_cache = ResponseCache()
+
+
+@metrics.instrument("ai_context")
+def build_context(question=""):
+    # Faktet e parallogaritura më të lidhura me pyetjen, brenda buxhetit të tokenëve
+    return context_builder.build(question)
+
+
+def make_assistant(api_key=None, offline=False):
+    # Faqja e ruan me st.cache_resource: një asistent për çdo çelës API
+    backend = StubBackend() if offline else GeminiBackend(api_key)
+    return Assistant(backend, response_cache)
+
+
+if __name__ == "__main__":
+    # python -m agrolindi.assistant  -> vonesa dhe cache me modelin lokal
+    assistant = make_assistant(offline=True)
+    questions = ["Cilat produkte po mbarojnë?", "Sa shitje kemi?", "Cilat produkte po mbarojnë?"] * 3
+    for q in questions:
+        started = time.perf_counter()
+        text = "".join(assistant.ask(q, build_context(q), data_version()))
+        print(f"{time.perf_counter() - started:6.3f}s  (e para: {assistant.last_latency:.3f}s)  {q}")
+    print(response_cache.stats(), f"thirrje modeli: {assistant.backend.calls}")
@@ -0,0 +1,116 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+# --- CACHE NË MEMORIE (VERSION-AWARE) ---
+# Çdo hyrje mban versionin lokal (numëruesi i shkrimeve në këtë proces) dhe
+# versionin e ruajtur në backend. Një rerun pa ndryshime nuk prek diskun;
+# versioni i ruajtur rikontrollohet vetëm pas `recheck_seconds`, që të
+# dallohen edhe shkrimet nga procese të tjera.
+
+_MISSING = object()
+
+
+class DataCache:
+    def __init__(self, max_bytes=64 * 1024 * 1024, recheck_seconds=2.0, key_fn=None):
+        self.max_bytes = max_bytes
+        self.key_fn = key_fn
+        self.recheck_seconds = recheck_seconds
+        self._entries = OrderedDict()  # key -> [local, stored, checked_at, data, size, positions]
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, backend, local):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == local:
+                if now - entry[2] < self.recheck_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[3]
+        stored = backend.stored_version(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == local and entry[1] == stored:
+                entry[2] = now
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[3]
+            self.misses += 1
+
+        data = backend.load(key, _MISSING)
+        if data is _MISSING:
+            return None
+        size = len(json.dumps(data))
+        with self._lock:
+            self._drop(key)
+            if size <= self.max_bytes:
+                self._entries[key] = [local, stored, now, data, size, None]
+                self._bytes += size
+                # LRU: nxirren hyrjet më të vjetra derisa të hyjmë në kufi
+                while self._bytes > self.max_bytes:
+                    old_key = next(iter(self._entries))
+                    self._drop(old_key)
+        return data
+
+    def apply(self, key, records, old_local, new_local, old_stored, new_stored):
+        # Përditësim në vend pas një shkrimi të pjesshëm. Lejohet vetëm nëse
+        # hyrja ishte e sakta para shkrimit; përndryshe hidhet.
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            if self.key_fn is None or entry[0] != old_local or entry[1] != old_stored:
+                self._drop(key)
+                return
+            data = entry[3]
+            positions = entry[5]
+            if positions is None:
+                positions = entry[5] = {self.key_fn(key, r): i for i, r in enumerate(data)}
+            for record in records:
+                rid = self.key_fn(key, record)
+                pos = positions.get(rid)
+                delta = len(json.dumps(record))
+                if pos is None:
+                    positions[rid] = len(data)
+                    data.append(record)
+                else:
+                    delta -= len(json.dumps(data[pos]))
+                    data[pos] = record
+                entry[4] += delta
+                self._bytes += delta
+            entry[0] = new_local
+            entry[1] = new_stored
+            entry[2] = time.monotonic()
+
+    def version(self, key):
+        # (lokal, i ruajtur) i të dhënave që mban hyrja, ose None
+        with self._lock:
+            entry = self._entries.get(key)
+            return None if entry is None else (entry[0], entry[1])
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[4]
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._bytes = 0
+            else:
+                self._drop(key)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
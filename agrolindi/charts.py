@@ -0,0 +1,146 @@
+import threading
+from collections import OrderedDict
+from datetime import date, timedelta
+
+import plotly.graph_objects as go
+
+from agrolindi import metrics
+from agrolindi.products import get_repository
+from agrolindi.rollups import get_rollups
+from agrolindi.storage import cached_version
+
+# --- GRAFIKËT (FIGURA TË CACHE-UARA) ---
+# Figurat ndërtohen nga përmbledhjet ditore (rollups), jo nga shitjet bruto,
+# dhe ruhen sipas versionit të të dhënave dhe dritares: një rerun pa shitje të
+# reja s'ndërton asgjë. Intervalet e gjata grupohen në javë/muaj/vite në
+# server, ndaj një grafik s'ka kurrë më shumë se MAX_POINTS shtylla, sado e
+# gjatë të jetë historia.
+
+MAX_POINTS = 120
+# Dritarja -> (ditët, njësia); None = e gjithë historia, njësia sipas gjatësisë
+WINDOWS = {
+    "7 ditë": (7, "day"),
+    "30 ditë": (30, "day"),
+    "12 muaj": (365, "month"),
+    "Gjithçka": (None, None),
+}
+UNIT_DAYS = {"day": 1, "week": 7, "month": 30.4, "year": 365.25}
+UNIT_LABELS = {"day": "Ditë", "week": "Javë", "month": "Muaj", "year": "Vit"}
+CACHE_SIZE = 32
+
+_cache = OrderedDict()  # (grafiku, dritarja) -> (versioni, figura)
+_lock = threading.Lock()
+
+
+def granularity(days):
+    # Njësia më e imët që e mban grafikun brenda MAX_POINTS
+    for unit, size in UNIT_DAYS.items():
+        if days / size <= MAX_POINTS:
+            return unit
+    return "year"
+
+
+def bucket_of(d, unit):
+    if unit == "day":
+        return d.isoformat()
+    if unit == "week":
+        return (d - timedelta(days=d.weekday())).isoformat()
+    if unit == "month":
+        return d.isoformat()[:7]
+    return d.isoformat()[:4]
+
+
+def sales_series(window, today=None):
+    # Xhiroja dhe faturat sipas njësisë së dritares; periudhat pa shitje dalin me 0
+    today = today or date.today()
+    days, unit = WINDOWS[window]
+    by_day = {r['key']: r for r in get_rollups("day") if r['key']}
+    if days and unit == "month":
+        # Muaj të plotë kalendarikë, i fundit është muaji aktual
+        month = today.year * 12 + today.month - round(days / UNIT_DAYS["month"])
+        start = date(month // 12, month % 12 + 1, 1)
+    elif days:
+        start = today - timedelta(days=days - 1)
+    else:
+        start = date.fromisoformat(min(by_day)) if by_day else today
+    unit = unit or granularity((today - start).days + 1)
+
+    labels = []
+    revenue = {}
+    orders = {}
+    d = start
+    while d <= today:
+        key = bucket_of(d, unit)
+        if key not in revenue:
+            labels.append(key)
+            revenue[key] = 0.0
+            orders[key] = 0
+        row = by_day.get(d.isoformat())
+        if row:
+            revenue[key] += row['revenue']
+            orders[key] += row['orders']
+        d += timedelta(days=1)
+    return {"labels": labels, "revenue": [round(revenue[k], 2) for k in labels],
+            "orders": [orders[k] for k in labels], "unit": unit}
+
+
+def _version(today):
+    # Versioni i përmbledhjeve që lexon grafiku, përfshirë shkrimet nga procese
+    # të tjera (p.sh. API); jo ai i backend-it, që mund t'i dalë para cache-it
+    return today, cached_version("rollups")
+
+
+def _cached(name, window, version, build):
+    with _lock:
+        entry = _cache.get((name, window))
+        if entry is not None and entry[0] == version:
+            _cache.move_to_end((name, window))
+            return entry[1]
+    with metrics.span("chart_build"):
+        fig = build()
+    with _lock:
+        _cache[(name, window)] = (version, fig)
+        _cache.move_to_end((name, window))
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return fig
+
+
+def sales_chart(window, today=None):
+    today = today or date.today()
+
+    def build():
+        if not get_rollups("day"):
+            return None
+        s = sales_series(window, today)
+        fig = go.Figure(go.Bar(
+            x=s["labels"], y=s["revenue"], customdata=s["orders"],
+            hovertemplate="%{x}<br>%{y:.2f} €<br>%{customdata} fatura<extra></extra>",
+        ))
+        fig.update_layout(xaxis_title=UNIT_LABELS[s["unit"]], yaxis_title="Euro",
+                          margin=dict(l=10, r=10, t=10, b=10))
+        # Javët/muajt si etiketa, jo si data të vazhdueshme
+        fig.update_xaxes(type="category")
+        return fig
+
+    return _cached("sales", window, _version(today), build)
+
+
+def top_products_chart(n=5):
+    def build():
+        repo = get_repository()
+        top = sorted(get_rollups("product"), key=lambda r: -r['quantity'])[:n]
+        if not top:
+            return None
+        fig = go.Figure(go.Pie(labels=[repo.name_of(r['key']) for r in top], values=[r['quantity'] for r in top],
+                               hole=0.4))
+        fig.update_layout(margin=dict(l=10, r=10, t=10, b=10))
+        return fig
+
+    # Përmbledhjet e produkteve janë gjithsej (përfshirë arkivin), pa dritare
+    return _cached("top", n, _version(date.today()) + (cached_version("products"),), build)
+
+
+def clear():
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,248 @@
+import threading
+from datetime import date, timedelta
+
+import numpy as np
+
+from agrolindi.analytics import get_snapshot
+from agrolindi.debts import get_ledger
+from agrolindi.forecast import get_forecast, outlook
+from agrolindi.products import get_repository
+from agrolindi.rollups import get_rollups
+from agrolindi.search import fold, tokens
+from agrolindi.storage import cached_version
+
+# --- KONTEKSTI I ASISTENTIT ---
+# Përmbledhje kompakte të parallogaritura (shpejtësia e shitjes, ditët e
+# mbetura të stokut, debitorët kryesorë, marzhet sipas kategorisë, trendet).
+# Çdo seksion rillogaritet vetëm kur ndryshon koleksioni nga i cili varet;
+# për çdo pyetje zgjidhen faktet më të lidhura deri në një buxhet fiks
+# tokenësh, ndaj madhësia e prompt-it nuk rritet me historinë e dyqanit.
+
+TOKEN_BUDGET = 600
+WINDOW_DAYS = 30
+TREND_DAYS = 7
+
+HEADER = ("Ti je asistenti i dyqanit bujqësor AGROLINDI RH. "
+          "Përgjigju në shqip, vetëm mbi bazën e të dhënave më poshtë.")
+
+# Fjalë të pyetjes (prefikse, pa theks) që e bëjnë një seksion më të rëndësishëm
+SECTION_KEYWORDS = {
+    "stock": ("stok", "mbaro", "mbet", "porosi", "furniz", "sasi", "ditë", "dite"),
+    "sales": ("shitje", "shit", "trend", "javë", "jave", "muaj", "xhiro", "fatur", "sot"),
+    "categories": ("kategori", "marzh", "fitim"),
+    "top": ("top", "më të shitur", "me te shitur", "popullar", "fitim"),
+    "debts": ("borxh", "detyr", "pagu", "vonuar", "klient", "debitor", "kredi"),
+}
+SECTION_TITLES = {
+    "sales": "Shitjet",
+    "stock": "Stoku (shpejtësia e shitjes dhe riporositja)",
+    "top": "Produktet kryesore (30 ditë)",
+    "categories": "Marzhet sipas kategorisë (30 ditë)",
+    "debts": "Borxhet",
+}
+SECTION_DEPENDS = {
+    "sales": ("sales", "rollups"),
+    "stock": ("forecast", "products"),
+    "top": ("sales", "products"),
+    "categories": ("sales", "products"),
+    "debts": ("debts",),
+}
+
+
+def estimate_tokens(text):
+    # Përafrim i thjeshtë: ~4 karaktere për token
+    return len(text) // 4 + 1
+
+
+def _fact(text, weight, *names):
+    # Fakt = (teksti, pesha bazë, fjalët e emrave që e lidhin me pyetjen)
+    words = set()
+    for name in names:
+        words.update(tokens(name))
+    return text, weight, frozenset(words)
+
+
+def _window(today, days):
+    return (today - timedelta(days=days)).isoformat(), (today + timedelta(days=1)).isoformat()
+
+
+def _sales_facts(today):
+    snap = get_snapshot()
+    facts = []
+    week = snap.summary(*_window(today, TREND_DAYS))
+    prev_start = (today - timedelta(days=2 * TREND_DAYS)).isoformat()
+    prev = snap.summary(prev_start, (today - timedelta(days=TREND_DAYS)).isoformat())
+    change = f"{(week['revenue'] / prev['revenue'] - 1) * 100:+.0f}%" if prev['revenue'] else "pa krahasim"
+    facts.append(_fact(f"7 ditët e fundit: {week['orders']} fatura, {week['revenue']:.2f}€ "
+                       f"(java para: {prev['revenue']:.2f}€, {change}), fitim {week['profit']:.2f}€.", 3.0))
+    month = snap.summary(*_window(today, WINDOW_DAYS))
+    facts.append(_fact(f"30 ditët e fundit: {month['orders']} fatura, {month['revenue']:.2f}€, "
+                       f"fitim {month['profit']:.2f}€ (marzh {month['margin'] * 100:.0f}%).", 2.5))
+    # Nga përmbledhjet, që përfshijnë edhe periudhat e arkivuara (snapshot-i ka vetëm shitjet e gjalla)
+    by_payment = get_rollups("payment")
+    total = {"orders": sum(r['orders'] for r in by_payment), "revenue": sum(r['revenue'] for r in by_payment)}
+    facts.append(_fact(f"Gjithsej historikisht: {total['orders']} fatura, {total['revenue']:.2f}€.", 1.0))
+    daily = snap.daily_totals(*_window(today, WINDOW_DAYS))
+    if daily["date"]:
+        best = int(np.argmax(daily["total"]))
+        facts.append(_fact(f"Dita më e mirë në 30 ditë: {daily['date'][best]} me {daily['total'][best]:.2f}€.", 1.0))
+    return facts
+
+
+def _stock_facts(today):
+    # Nga tabela e parashikimit; vetëm stoku merret i freskët nga produktet
+    forecast = get_forecast()
+    rows = []
+    for p in get_repository():
+        row = forecast.get(p['id'])
+        days_left, reorder = outlook(p, row)
+        stock = p.get('stock', 0)
+        rows.append((days_left if days_left is not None else (0.0 if stock <= 0 else 1e9), p, row, days_left, reorder))
+    rows.sort(key=lambda r: r[0])
+    facts = []
+    # Të gjitha produktet mbahen si fakte: ato me stok të bollshëm kanë peshë të
+    # ulët dhe hyjnë në prompt vetëm kur pyetja i përmend me emër
+    for _, p, row, days_left, reorder in rows:
+        stock = p.get('stock', 0)
+        if days_left is None:
+            text = f"{p['name']}: stok {stock}, pa shitje në 90 ditë."
+            weight = 1.5 if stock <= 0 else 1.0 if stock < 5 else 0.2
+        else:
+            text = f"{p['name']}: stok {stock}, shiten {row['velocity']:.1f}/ditë, mjafton ~{days_left:.0f} ditë."
+            if reorder and stock <= row['reorderPoint']:
+                text += f" Porosit ~{reorder} copë (furnizimi ~{row['leadDays']:.0f} ditë)."
+            weight = 3.0 if days_left < 7 else 2.0 if days_left < 30 else 0.5
+        facts.append(_fact(text, weight, p['name'], p.get('category', '')))
+    return facts
+
+
+def _top_facts(today):
+    snap = get_snapshot()
+    repo = get_repository()
+    top = snap.top_products(10, *_window(today, WINDOW_DAYS), by="revenue")
+    facts = []
+    for i, pid in enumerate(top["product_id"]):
+        name = repo.name_of(pid)
+        facts.append(_fact(f"{name}: {top['quantity'][i]:g} copë, {top['revenue'][i]:.2f}€, "
+                           f"fitim {top['profit'][i]:.2f}€.", 2.0 - i * 0.1, name))
+    return facts
+
+
+def _category_facts(today):
+    mix = get_snapshot().category_mix(*_window(today, WINDOW_DAYS))
+    facts = []
+    for i, category in enumerate(mix["category"]):
+        facts.append(_fact(f"{category or 'Pa kategori'}: {mix['revenue'][i]:.2f}€, "
+                           f"marzh {mix['margin'][i] * 100:.0f}%.", 1.5 - i * 0.05, category))
+    return facts
+
+
+def _debt_facts(today):
+    ledger = get_ledger()
+    by_person = {}
+    # Kopje të bashkësive: libri përditësohet në vend nga shkrimet e sesioneve të tjera
+    for did in list(ledger.active):
+        debt = ledger.by_id[did]
+        name = debt['personName']
+        owed, count, overdue = by_person.get(name, (0.0, 0, 0))
+        by_person[name] = (owed + debt['amount'], count + 1, max(overdue, ledger.overdue.get(did, 0)))
+    total = sum(v[0] for v in by_person.values())
+    late = [ledger.by_id[d] for d in list(ledger.overdue) if d in ledger.active]
+    facts = [_fact(f"Borxhe aktive: {total:.2f}€ nga {len(by_person)} klientë; "
+                   f"{len(late)} të vonuara ({sum(d['amount'] for d in late):.2f}€).", 3.0)]
+    ranked = sorted(by_person.items(), key=lambda kv: -kv[1][0])
+    for i, (name, (owed, count, overdue)) in enumerate(ranked):
+        late_text = f", vonesë {overdue} ditë" if overdue else ""
+        facts.append(_fact(f"{name}: {owed:.2f}€ ({count} borxhe{late_text}).",
+                           max(2.0 if overdue else 1.5 - i * 0.02, 0.2), name))
+    return facts
+
+
+BUILDERS = {
+    "sales": _sales_facts,
+    "stock": _stock_facts,
+    "top": _top_facts,
+    "categories": _category_facts,
+    "debts": _debt_facts,
+}
+
+
+def source_version(key):
+    # Versioni i të dhënave që lexojnë ndërtuesit (përfshirë shkrimet nga procese
+    # të tjera, p.sh. API ose një arkë e dytë), jo vetëm numëruesi i këtij procesi
+    if key == "sales":
+        snap = get_snapshot()
+        return snap.generation, snap.last_seq
+    return cached_version(key)
+
+
+class ContextBuilder:
+    def __init__(self, budget=TOKEN_BUDGET):
+        self.budget = budget
+        self._sections = {}  # seksioni -> (versioni, faktet)
+        self._lock = threading.Lock()
+        self.rebuilds = 0
+
+    def section(self, name, today):
+        version = (today, tuple(source_version(k) for k in SECTION_DEPENDS[name]))
+        with self._lock:
+            cached = self._sections.get(name)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+        facts = BUILDERS[name](today)
+        with self._lock:
+            self._sections[name] = (version, facts)
+            self.rebuilds += 1
+        return facts
+
+    def relevance(self, question):
+        # Pikët e seksioneve dhe fjalët e pyetjes
+        folded = fold(question)
+        words = set(tokens(question))
+        hits = {name: sum(1 for kw in keywords if fold(kw) in folded) for name, keywords in SECTION_KEYWORDS.items()}
+        # Kur pyetja përmend një temë, seksionet e tjera kalojnë në plan të dytë
+        base = 0.5 if any(hits.values()) else 1.0
+        boosts = {name: base + 2.0 * n for name, n in hits.items()}
+        return boosts, words
+
+    def build(self, question="", today=None):
+        today = today or date.today()
+        boosts, words = self.relevance(question)
+        scored = []
+        for order, name in enumerate(BUILDERS):
+            for position, (text, weight, names) in enumerate(self.section(name, today)):
+                score = weight * boosts[name] + 4.0 * len(words & names)
+                scored.append((-score, order, position, name, text))
+        scored.sort()
+
+        header = f"{HEADER}\nData: {today.isoformat()}."
+        used = estimate_tokens(header)
+        chosen = {}
+        for _, order, position, name, text in scored:
+            cost = estimate_tokens(f"- {text}\n") + (0 if name in chosen else estimate_tokens(f"\n{SECTION_TITLES[name]}:\n"))
+            if used + cost > self.budget:
+                continue
+            used += cost
+            chosen.setdefault(name, []).append((position, text))
+
+        parts = [header]
+        for name in BUILDERS:
+            if name in chosen:
+                parts.append(f"\n{SECTION_TITLES[name]}:")
+                parts.extend(f"- {text}" for _, text in sorted(chosen[name]))
+        return "\n".join(parts)
+
+
+context_builder = ContextBuilder()
+
+
+if __name__ == "__main__":
+    # python -m agrolindi.context "pyetja"  -> konteksti i paketuar dhe madhësia e tij
+    import sys
+    import time
+
+    question = " ".join(sys.argv[1:])
+    started = time.perf_counter()
+    text = context_builder.build(question)
+    print(text)
+    print(f"\n~{estimate_tokens(text)} tokenë / {TOKEN_BUDGET}, {time.perf_counter() - started:.3f}s")
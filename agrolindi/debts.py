@@ -0,0 +1,174 @@
+import heapq
+import threading
+from datetime import date, datetime
+
+from agrolindi.search import fold
+from agrolindi.storage import add_write_listener, load_cached, run_transaction
+
+
+# --- BORXHET ---
+def record_payment(debt_id, pay_amt):
+    # Borxhi rilexohet brenda transaksionit: dy pagesa të njëkohshme nuk
+    # mbishkruajnë njëra-tjetrën
+    def apply(tx):
+        debt = tx.get("debts", debt_id)
+        if debt is None:
+            raise ValueError("Borxhi nuk ekziston!")
+        amount = min(pay_amt, debt['amount'])
+        debt['amount'] -= amount
+        history_entry = f"[{datetime.now().strftime('%Y-%m-%d')}] Paguar: {amount}€, Mbetja: {debt['amount']}€"
+
+        if 'history' not in debt: debt['history'] = []
+        debt['history'].append(history_entry)
+        debt['description'] += f"\n{history_entry}"
+
+        if debt['amount'] <= 0.01:
+            debt['isPaid'] = True
+            debt['amount'] = 0
+
+        tx.update("debts", debt)
+        return debt
+
+    return run_transaction(apply)
+
+
+# --- LIBRI I BORXHEVE (INDEKSE) ---
+# Indekse sipas statusit, marrëveshjes dhe datës së pagesës, plus një radhë
+# prioriteti me borxhet e vonuara (më i vonuari para). Vonesa llogaritet një
+# herë në ditë, jo në çdo render.
+
+FILTERS = ["Të Gjitha", "Aktive", "Me Marrëveshje", "Të Vonuara"]
+
+
+def _due_date(debt):
+    if not debt.get('paymentDueDate'):
+        return None
+    return datetime.fromisoformat(debt['paymentDueDate']).date()
+
+
+class DebtLedger:
+    def __init__(self, debts, today):
+        self.source = debts
+        self.today = today
+        self.order = []  # id-të sipas renditjes së regjistrimit
+        self.by_id = {}
+        self.active = set()
+        self.agreement = set()
+        self.overdue = {}  # id -> ditë vonesë
+        self.overdue_heap = []  # (data e pagesës, id)
+        self.heap_due = {}  # id -> data e hyrjes së vlefshme në heap
+        self.stale = 0  # hyrje të vjetruara që mbeten në heap deri në kompaktim
+        self.names = {}  # id -> emri i palosur, për kërkim
+        for debt in debts:
+            self._index(debt)
+
+    def _index(self, debt):
+        did = debt['id']
+        if did not in self.by_id:
+            self.order.append(did)
+        self.by_id[did] = debt
+        self.names[did] = fold(debt['personName'])
+        self.active.discard(did)
+        self.agreement.discard(did)
+        self.overdue.pop(did, None)
+        if not debt['isPaid'] and debt['amount'] > 0:
+            self.active.add(did)
+        if debt.get('hasAgreement'):
+            self.agreement.add(did)
+        due = _due_date(debt)
+        old = self.heap_due.pop(did, None)
+        if due is not None and not debt['isPaid'] and due <= self.today:
+            self.overdue[did] = (self.today - due).days
+            # Një pagesë që s'e ndryshon datën s'shton hyrje të re
+            if old != due:
+                heapq.heappush(self.overdue_heap, (due, did))
+                self.stale += old is not None
+            self.heap_due[did] = due
+        elif old is not None:
+            self.stale += 1
+
+    def apply(self, debts):
+        for debt in debts:
+            self._index(debt)
+        # Kur hyrjet e vjetruara bëhen shumë (> 1/4 e atyre të vlefshme), heap-i rindërtohet
+        if self.stale > max(64, len(self.heap_due) // 4):
+            self.overdue_heap = [(due, did) for did, due in self.heap_due.items()]
+            heapq.heapify(self.overdue_heap)
+            self.stale = 0
+
+    def status(self, debt_id):
+        # (i vonuar?, ditë vonesë), i llogaritur për sot
+        days = self.overdue.get(debt_id)
+        return days is not None, days or 0
+
+    def overdue_queue(self, n=None):
+        # Borxhet e vonuara, më i vonuari para. Në heap ka të shumtën `stale`
+        # hyrje të vjetruara, ndaj për n borxhe mjaftojnë n + stale më të vegjlat
+        entries = sorted(self.overdue_heap) if n is None else heapq.nsmallest(n + self.stale, self.overdue_heap)
+        seen = set()
+        result = []
+        for due, did in entries:
+            if did in seen or self.heap_due.get(did) != due:
+                continue
+            seen.add(did)
+            result.append(did)
+            if n is not None and len(result) >= n:
+                break
+        return result
+
+    def query(self, filter_type="Të Gjitha", search="", page=0, page_size=20):
+        # Kthen (borxhet e faqes, numri total)
+        if filter_type == "Aktive":
+            ids = [d for d in self.order if d in self.active]
+        elif filter_type == "Me Marrëveshje":
+            ids = [d for d in self.order if d in self.agreement]
+        elif filter_type == "Të Vonuara" and not search:
+            # Nga radha e prioritetit vetëm sa duhen deri në këtë faqe, pa renditje të plotë
+            # Kopje: apply() mund ta ndryshojë fjalorin nga një sesion tjetër
+            overdue = list(self.overdue)
+            zero = sum(1 for d in overdue if self.by_id[d]['amount'] <= 0)
+            ids = [d for d in self.overdue_queue((page + 1) * page_size + zero) if self.by_id[d]['amount'] > 0]
+            return [self.by_id[d] for d in ids[page * page_size:(page + 1) * page_size]], len(overdue) - zero
+        elif filter_type == "Të Vonuara":
+            ids = self.overdue_queue()
+        else:
+            ids = self.order
+        # Borxhet me shumë zero por të pashlyera fshihen si më parë
+        ids = [d for d in ids if not (self.by_id[d]['amount'] <= 0 and not self.by_id[d]['isPaid'])]
+        if search:
+            needle = fold(search)
+            ids = [d for d in ids if needle in self.names[d]]
+        return [self.by_id[d] for d in ids[page * page_size:(page + 1) * page_size]], len(ids)
+
+
+_ledger = None
+_ledger_lock = threading.Lock()
+
+
+def get_ledger():
+    # Rindërtohet kur ndryshon lista e borxheve ose dita
+    global _ledger
+    debts = load_cached("debts")
+    if debts is None:
+        debts = []
+    today = date.today()
+    with _ledger_lock:
+        if _ledger is None or _ledger.source is not debts or _ledger.today != today:
+            _ledger = DebtLedger(debts, today)
+        return _ledger
+
+
+def _on_write(key, records):
+    global _ledger
+    if key != "debts":
+        return
+    with _ledger_lock:
+        if _ledger is None:
+            return
+        if records is None:
+            _ledger = None
+        else:
+            _ledger.apply(records)
+
+
+add_write_listener(_on_write)
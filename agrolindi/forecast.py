@@ -0,0 +1,233 @@
+import math
+import os
+import statistics
+import threading
+import time
+import traceback
+from datetime import date, datetime, timedelta
+
+from agrolindi import metrics
+from agrolindi.periods import month_range
+from agrolindi.products import get_repository
+from agrolindi.storage import add_write_listener, load_cached, query_range, save_data
+
+# --- PARASHIKIMI I RIPOROSITJES ---
+# Një fije në sfond llogarit për çdo produkt shpejtësinë e shitjes (mesatare
+# lëvizëse 7/30/90 ditë, vektoriale mbi snapshot-in e analitikës), kohën e
+# furnizimit nga furnizimet e mëparshme dhe pikën e riporositjes, dhe i ruan
+# në koleksionin "forecast". Faqet dhe asistenti vetëm e lexojnë tabelën;
+# ditët e mbetura dhe sasia për porosi llogariten me stokun aktual.
+
+HISTORY_DAYS = 90
+# Sa ditë shitje mbulon një porosi përtej kohës së furnizimit
+COVER_DAYS = 14
+DEFAULT_LEAD_DAYS = 7
+MAX_LEAD_DAYS = 30
+# Stoku sigurie: z * devijimi ditor * sqrt(koha e furnizimit) (~95% shërbim)
+SAFETY_Z = 1.65
+# Rifreskimi periodik; pas shitjeve/furnizimeve të reja fija zgjohet më shpejt,
+# por jo më shpesh se një herë në MIN_GAP sekonda. 0 = pa fije (vetëm cron)
+INTERVAL = float(os.environ.get("AGROLINDI_FORECAST_INTERVAL", "900"))
+MIN_GAP = 30.0
+
+_refresh_lock = threading.Lock()
+_wake = threading.Event()
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def lead_times(supplies, archived=None):
+    # Furnizimet s'kanë datë porosie: si kohë furnizimi merret ritmi i dërgesave
+    # të furnizuesit (mediana e ditëve mes dy dërgesave të njëpasnjëshme), pra sa
+    # pritet zakonisht deri te dërgesa e radhës. archived: furnizuesi -> ditët
+    # e dërgesave në muajt e mbyllur
+    deliveries = {supplier: set(days) for supplier, days in (archived or {}).items()}
+    for s in supplies:
+        deliveries.setdefault(s['supplier'], set()).add(s['date'][:10])
+    leads = {}
+    for supplier, days in deliveries.items():
+        days = sorted(date.fromisoformat(d) for d in days)
+        gaps = [(b - a).days for a, b in zip(days, days[1:])]
+        if gaps:
+            leads[supplier] = min(MAX_LEAD_DAYS, max(1, statistics.median(gaps)))
+    return leads
+
+
+def compute(today=None):
+    # Kthen rreshtat e tabelës "forecast", një për produkt
+    import numpy as np
+
+    from agrolindi.analytics import day_number, get_snapshot
+
+    today = today or date.today()
+    snap = get_snapshot()
+    repo = get_repository()
+    end = day_number(today.isoformat()) + 1
+    start = end - HISTORY_DAYS
+    lines = snap.lines.view()
+    m = (lines["day"] >= start) & (lines["day"] < end)
+    # Matrica produkt x ditë e sasive të shitura, me një bincount të vetëm
+    size = len(snap.products)
+    cells = lines["product"][m].astype(np.int64) * HISTORY_DAYS + (lines["day"][m] - start)
+    daily = np.bincount(cells, weights=lines["quantity"][m], minlength=size * HISTORY_DAYS)
+    daily = daily.reshape(size, HISTORY_DAYS)
+    # Muajt e mbyllur s'kanë më shitje ditore në snapshot: mesataret
+    # pjesëtohen vetëm me ditët e gjalla të dritares, jo me 90
+    since = (today - timedelta(days=365)).isoformat()
+    periods = sorted((p for p in load_cached("periods") or [] if p['id'] >= since[:7]), key=lambda p: p['id'])
+    live = HISTORY_DAYS
+    if periods:
+        first_live = month_range(date.fromisoformat(f"{periods[-1]['id']}-01"))[1]
+        live = max(1, min(HISTORY_DAYS, end - day_number(first_live)))
+    ma7 = daily[:, -7:].sum(axis=1) / min(7, live)
+    ma30 = daily[:, -30:].sum(axis=1) / min(30, live)
+    ma90 = daily.sum(axis=1) / live
+    # Java e fundit ka peshë, por një javë e vetme s'e zhvendos krejt parashikimin
+    velocity = 0.25 * ma7 + 0.45 * ma30 + 0.3 * ma90
+    deviation = daily[:, -min(30, live):].std(axis=1)
+
+    # Furnizimet e gjalla + dërgesat e muajve të mbyllur nga përmbledhjet e tyre
+    supplies = query_range("supplies", since, (today + timedelta(days=1)).isoformat())
+    archived = {}
+    last_supplier = {}
+    for period in periods:
+        for supplier, days in period.get("deliveries", {}).items():
+            archived.setdefault(supplier, set()).update(d for d in days if d >= since)
+        for item_name, supplier in period.get("lastSupplier", {}).items():
+            p = repo.find_by_name(item_name)
+            if p:
+                last_supplier[p['id']] = supplier
+    leads = lead_times(supplies, archived)
+    for s in sorted(supplies, key=lambda s: s['date']):
+        p = repo.find_by_name(s['itemName'])
+        if p:
+            last_supplier[p['id']] = s['supplier']
+
+    computed_at = datetime.now().isoformat(timespec="seconds")
+    rows = []
+    for p in repo:
+        code = snap._codes["products"].get(p['id'])
+        # Kod i shtuar pas pamjes së kolonave = pa shitje në matricë
+        v, s7, s30, s90, sd = (0.0,) * 5 if code is None or code >= size else (
+            velocity[code], ma7[code], ma30[code], ma90[code], deviation[code])
+        supplier = last_supplier.get(p['id'])
+        lead = leads.get(supplier, DEFAULT_LEAD_DAYS)
+        reorder_point = v * lead + SAFETY_Z * sd * math.sqrt(lead)
+        rows.append({
+            "id": p['id'],
+            "velocity": round(float(v), 3),
+            "ma7": round(float(s7), 3),
+            "ma30": round(float(s30), 3),
+            "ma90": round(float(s90), 3),
+            "supplier": supplier,
+            "leadDays": lead,
+            "reorderPoint": round(float(reorder_point), 2),
+            "target": round(float(reorder_point + v * COVER_DAYS), 2),
+            "computedAt": computed_at,
+        })
+    return rows
+
+
+@metrics.instrument("forecast")
+def refresh(today=None):
+    with _refresh_lock:
+        rows = compute(today)
+        save_data("forecast", rows)
+        return rows
+
+
+# --- LEXIMI (FAQET, ASISTENTI) ---
+_by_id = (None, {})
+
+
+def get_forecast():
+    # id -> rreshti; llogaritet në vend vetëm herën e parë, kur tabela mungon
+    global _by_id
+    rows = load_cached("forecast")
+    if rows is None:
+        refresh()
+        rows = load_cached("forecast") or []
+    source, by_id = _by_id
+    if source is not rows:
+        by_id = {r['id']: r for r in rows}
+        _by_id = (rows, by_id)
+    return by_id
+
+
+def outlook(product, row):
+    # Ditët e mbetura dhe sasia për porosi, me stokun aktual të produktit
+    stock = product.get('stock', 0)
+    velocity = row['velocity'] if row else 0.0
+    days_left = stock / velocity if velocity > 0 else None
+    reorder = max(0, math.ceil(row['target'] - stock)) if row else 0
+    return days_left, reorder
+
+
+def needs_reorder(product, row):
+    stock = product.get('stock', 0)
+    if stock <= 0:
+        return True
+    return bool(row) and row['velocity'] > 0 and stock <= row['reorderPoint']
+
+
+def reorder_list():
+    # Produktet nën pikën e riporositjes, sipas ditëve të mbetura
+    forecast = get_forecast()
+    result = []
+    for p in get_repository():
+        row = forecast.get(p['id'])
+        if needs_reorder(p, row):
+            days_left, reorder = outlook(p, row)
+            result.append({"name": p['name'], "category": p.get('category', ''), "stock": p.get('stock', 0),
+                           "velocity": row['velocity'] if row else 0.0,
+                           "daysLeft": round(days_left, 1) if days_left is not None else 0.0,
+                           "reorderQty": reorder, "supplier": row['supplier'] if row else None})
+    result.sort(key=lambda r: r['daysLeft'])
+    return result
+
+
+# --- FIJA NË SFOND ---
+def _run(interval):
+    last = 0.0
+    while True:
+        wait = max(0.0, MIN_GAP - (time.monotonic() - last))
+        if wait:
+            time.sleep(wait)
+        _wake.clear()
+        try:
+            refresh()
+        except Exception:
+            # Fija s'duhet të ndalet nga një gabim i vetëm; provohet sërish më vonë
+            traceback.print_exc()
+        last = time.monotonic()
+        _wake.wait(interval)
+
+
+def start_worker(interval=INTERVAL):
+    # Idempotent: një fije për proces
+    global _worker
+    if interval <= 0:
+        return None
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_run, args=(interval,), name="agrolindi-forecast", daemon=True)
+            _worker.start()
+        return _worker
+
+
+def _on_write(key, records):
+    if key in ("sales", "supplies"):
+        _wake.set()
+
+
+add_write_listener(_on_write)
+
+
+if __name__ == "__main__":
+    # python -m agrolindi.forecast  -> rifreskon tabelën (p.sh. me cron) dhe tregon listën e porosive
+    started = time.perf_counter()
+    rows = refresh()
+    print(f"{len(rows)} produkte në {time.perf_counter() - started:.2f}s")
+    for r in reorder_list()[:20]:
+        print(f"{r['name']}: stok {r['stock']}, {r['velocity']:.1f}/ditë, ~{r['daysLeft']:.0f} ditë, "
+              f"porosit {r['reorderQty']} ({r['supplier'] or '-'})")
@@ -0,0 +1,60 @@
+from bisect import bisect_right
+from collections import deque
+
+from agrolindi import metrics
+from agrolindi.storage import get_record, update_record
+
+# --- LOGJIKA KRYESORE (FIFO & STOKU) ---
+# Batch-et e çdo produkti mbahen gjithmonë të renditura sipas datës
+# (më e vjetra para), kështu që shitja i konsumon nga fillimi pa renditje.
+
+
+def add_batch(p, batch):
+    batches = p.setdefault('batches', [])
+    if not batches or batches[-1]['date'] <= batch['date']:
+        batches.append(batch)
+    else:
+        # Furnizim me datë të vjetër: futet në vendin e duhur
+        dates = [b['date'] for b in batches]
+        batches.insert(bisect_right(dates, batch['date']), batch)
+
+
+def apply_fifo(p, qty_sold):
+    # Zbrit stokun total
+    p['stock'] -= qty_sold
+
+    # FIFO LOGIC: Zbrit nga batches (Furnizimet e vjetra) dhe mbaj koston e saktë
+    qty_needed = qty_sold
+    cost = 0.0
+    consumed = []
+    batches = deque(p.get('batches', []))
+
+    while qty_needed > 0 and batches:
+        batch = batches[0]
+        take = min(batch['quantity'], qty_needed)
+        cost += take * batch.get('cost', 0)
+        consumed.append({"batch_id": batch['id'], "quantity": take, "cost": batch.get('cost', 0)})
+        qty_needed -= take
+        if take == batch['quantity']:
+            # Batch u zbraz, nuk e mbajmë më
+            batches.popleft()
+        else:
+            batch['quantity'] -= take
+
+    if qty_needed > 0:
+        # Stok pa batch (të dhëna të vjetra): kosto sipas çmimit aktual të blerjes
+        cost += qty_needed * p.get('purchasePrice', 0)
+
+    p['batches'] = list(batches)
+    return cost, consumed
+
+
+@metrics.instrument("update_stock_fifo")
+def update_stock_fifo(product_id, qty_sold):
+    p = get_record("products", product_id)
+    if not p:
+        return 0.0
+    cost, _ = apply_fifo(p, qty_sold)
+    # Ruhet vetëm produkti i prekur, jo i gjithë katalogu
+    update_record("products", p)
+    return cost
@@ -0,0 +1,194 @@
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# --- INSTRUMENTIMI (PERFORMANCA) ---
+# Koha, bajtët e lexuar/shkruar dhe numri i thirrjeve për çdo operacion,
+# të grupuara sipas rerun-it dhe faqes. Kur matja është e fikur, çdo
+# funksion i instrumentuar kushton vetëm një kontroll flamuri.
+# Kohët janë përfshirëse: një operacion brenda një tjetri numërohet te të dy.
+
+enabled = os.environ.get("AGROLINDI_METRICS") == "1"
+# Dosja ku shkruhen metrics.json dhe metrics.prom pas çdo rerun-i (bosh = pa eksport)
+EXPORT_DIR = os.environ.get("AGROLINDI_METRICS_DIR", "")
+HISTORY = 200
+
+_local = threading.local()
+_lock = threading.Lock()
+reruns = deque(maxlen=HISTORY)  # rerun-et e fundit, si fjalorë
+pages = {}  # faqja -> {"reruns", "seconds", "ops": {operacioni -> statistikat}}
+# Operacionet jashtë një rerun-i (fije në sfond, mjete) shkojnë te kjo "faqe"
+BACKGROUND = "-"
+
+
+def enable(on=True):
+    global enabled
+    enabled = on
+
+
+def _stats():
+    return {"calls": 0, "seconds": 0.0, "bytes_read": 0, "bytes_written": 0}
+
+
+def _merge(into, stats):
+    for field, value in stats.items():
+        into[field] = into.get(field, 0) + value
+
+
+class Rerun:
+    def __init__(self, page):
+        self.page = page
+        self.started = time.time()
+        self.t0 = time.perf_counter()
+        self.last = self.t0
+        self.seconds = None
+        self.ops = {}
+
+    def add(self, op, stats):
+        _merge(self.ops.setdefault(op, _stats()), stats)
+        self.last = time.perf_counter()
+
+    def as_dict(self):
+        return {"page": self.page, "started": self.started, "seconds": self.seconds, "ops": self.ops}
+
+
+def count_bytes(read=0, written=0):
+    # Thirret nga backend-et e ruajtjes; i atribuohet operacionit që po matet
+    _local.bytes_read = getattr(_local, "bytes_read", 0) + read
+    _local.bytes_written = getattr(_local, "bytes_written", 0) + written
+
+
+def record(op, seconds, bytes_read=0, bytes_written=0):
+    stats = {"calls": 1, "seconds": seconds, "bytes_read": bytes_read, "bytes_written": bytes_written}
+    rerun = getattr(_local, "rerun", None)
+    if rerun is not None and rerun.seconds is None:
+        rerun.add(op, stats)
+        return
+    with _lock:
+        page = pages.setdefault(BACKGROUND, {"reruns": 0, "seconds": 0.0, "ops": {}})
+        _merge(page["ops"].setdefault(op, _stats()), stats)
+
+
+class span:
+    # with span("chart"): ...  -> mat një bllok kodi
+    def __init__(self, op):
+        self.op = op
+
+    def __enter__(self):
+        if enabled:
+            self.start = (time.perf_counter(), getattr(_local, "bytes_read", 0), getattr(_local, "bytes_written", 0))
+        else:
+            self.start = None
+        return self
+
+    def __exit__(self, *exc):
+        if self.start is not None:
+            t0, read0, written0 = self.start
+            record(self.op, time.perf_counter() - t0, getattr(_local, "bytes_read", 0) - read0,
+                   getattr(_local, "bytes_written", 0) - written0)
+        return False
+
+
+def instrument(op):
+    # Dekorator; për gjeneratorët matet e gjithë konsumimi i tyre
+    def decorate(fn):
+        if inspect.isgeneratorfunction(fn):
+            @functools.wraps(fn)
+            def gen_wrapper(*args, **kwargs):
+                if not enabled:
+                    yield from fn(*args, **kwargs)
+                    return
+                with span(op):
+                    yield from fn(*args, **kwargs)
+            return gen_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return fn(*args, **kwargs)
+            with span(op):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def begin_rerun(page):
+    # Kthen rerun-in e ri (ose None kur matja është e fikur)
+    if not enabled:
+        _local.rerun = None
+        return None
+    rerun = _local.rerun = Rerun(page)
+    return rerun
+
+
+def end_rerun(rerun):
+    # Idempotent; një rerun i ndërprerë (st.stop, st.rerun) mbyllet në fillim
+    # të rerun-it tjetër, me kohën e operacionit të fundit të matur
+    if rerun is None or rerun.seconds is not None:
+        return
+    if getattr(_local, "rerun", None) is rerun:
+        rerun.last = time.perf_counter()
+        _local.rerun = None
+    rerun.seconds = rerun.last - rerun.t0
+    with _lock:
+        reruns.append(rerun.as_dict())
+        page = pages.setdefault(rerun.page, {"reruns": 0, "seconds": 0.0, "ops": {}})
+        page["reruns"] += 1
+        page["seconds"] += rerun.seconds
+        for op, stats in rerun.ops.items():
+            _merge(page["ops"].setdefault(op, _stats()), stats)
+    if EXPORT_DIR:
+        export(EXPORT_DIR)
+
+
+def snapshot():
+    with _lock:
+        return {"reruns": list(reruns), "pages": json.loads(json.dumps(pages))}
+
+
+def reset():
+    with _lock:
+        reruns.clear()
+        pages.clear()
+
+
+def to_json():
+    return json.dumps(snapshot(), indent=2)
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+
+def to_prometheus():
+    data = snapshot()["pages"]
+    lines = []
+    for field, metric in (("reruns", "agrolindi_reruns_total"), ("seconds", "agrolindi_rerun_seconds_total")):
+        lines.append(f"# TYPE {metric} counter")
+        for page, totals in sorted(data.items()):
+            value = f"{totals[field]:.6f}" if field == "seconds" else totals[field]
+            lines.append(f'{metric}{{page="{_label(page)}"}} {value}')
+    for field, metric in (("calls", "agrolindi_op_calls_total"), ("seconds", "agrolindi_op_seconds_total"),
+                          ("bytes_read", "agrolindi_op_bytes_read_total"),
+                          ("bytes_written", "agrolindi_op_bytes_written_total")):
+        lines.append(f"# TYPE {metric} counter")
+        for page, totals in sorted(data.items()):
+            for op, stats in sorted(totals["ops"].items()):
+                value = f"{stats[field]:.6f}" if field == "seconds" else stats[field]
+                lines.append(f'{metric}{{page="{_label(page)}",op="{_label(op)}"}} {value}')
+    return "\n".join(lines) + "\n"
+
+
+def export(directory):
+    # Shkrim atomik i dy skedarëve; skedarët mbahen të vegjël (HISTORY rerun-e)
+    os.makedirs(directory, exist_ok=True)
+    for name, text in (("metrics.json", to_json()), ("metrics.prom", to_prometheus())):
+        # Një skedar i përkohshëm për fije: sesionet e serverit eksportojnë njëkohësisht
+        tmp = os.path.join(directory, f"{name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "w") as f:
+            f.write(text)
+        os.replace(tmp, os.path.join(directory, name))
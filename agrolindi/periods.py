@@ -0,0 +1,35 @@
+from datetime import date, timedelta
+
+from agrolindi.storage import query_range
+
+# --- PERIUDHAT E RAPORTEVE ---
+# Çdo funksion kthen intervalin [fillimi, fundi) si data ISO, që të
+# krahasohet drejtpërdrejt me fushën 'date' të shitjeve dhe furnizimeve.
+
+
+def day_range(d):
+    return d.isoformat(), (d + timedelta(days=1)).isoformat()
+
+
+def week_range(d):
+    start = d - timedelta(days=d.weekday())
+    return start.isoformat(), (start + timedelta(days=7)).isoformat()
+
+
+def month_range(d):
+    start = d.replace(day=1)
+    end = date(start.year + (start.month == 12), start.month % 12 + 1, 1)
+    return start.isoformat(), end.isoformat()
+
+
+def custom_range(start, end):
+    # Të dyja datat përfshihen
+    return start.isoformat(), (end + timedelta(days=1)).isoformat()
+
+
+def sales_between(start, end):
+    return query_range("sales", start, end)
+
+
+def supplies_between(start, end):
+    return query_range("supplies", start, end)
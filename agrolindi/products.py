@@ -0,0 +1,89 @@
+import threading
+
+from agrolindi.storage import add_write_listener, load_cached
+
+# --- REPOZITORI I PRODUKTEVE ---
+# Indekse hash sipas id-së, emrit të normalizuar dhe barkodit. Ndërtohen një herë për
+# çdo version të të dhënave dhe përditësohen në vend pas çdo insert/update.
+
+
+def normalize_name(name):
+    return " ".join(str(name).lower().split())
+
+
+class ProductRepository:
+    def __init__(self, products):
+        self.source = products
+        self.by_id = {}
+        self.by_name = {}
+        self.by_barcode = {}
+        for p in products:
+            self._index(p)
+
+    def _index(self, p):
+        old = self.by_id.get(p['id'])
+        if old is not None and normalize_name(old['name']) != normalize_name(p['name']):
+            self.by_name.pop(normalize_name(old['name']), None)
+        if old is not None and old.get('barcode') and old.get('barcode') != p.get('barcode'):
+            self.by_barcode.pop(old['barcode'], None)
+        self.by_id[p['id']] = p
+        self.by_name[normalize_name(p['name'])] = p
+        if p.get('barcode'):
+            self.by_barcode[p['barcode']] = p
+
+    def apply(self, records):
+        for p in records:
+            self._index(p)
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def __iter__(self):
+        # Kopje: listener-i i shkrimeve shton produkte nën _repo_lock ndërsa lexuesit
+        # (fija e parashikimit, faqet) iterojnë pa bravë
+        return iter(list(self.by_id.values()))
+
+    def get(self, product_id):
+        return self.by_id.get(product_id)
+
+    def find_by_name(self, name):
+        return self.by_name.get(normalize_name(name))
+
+    def find_by_barcode(self, code):
+        return self.by_barcode.get(str(code).strip())
+
+    def name_of(self, product_id, default="Unknown"):
+        p = self.by_id.get(product_id)
+        return p['name'] if p else default
+
+
+_repo = None
+_repo_lock = threading.Lock()
+
+
+def get_repository():
+    # Rindërtohet vetëm kur cache-i ka ngarkuar një listë të re produktesh
+    global _repo
+    products = load_cached("products")
+    if products is None:
+        products = []
+    with _repo_lock:
+        if _repo is None or _repo.source is not products:
+            _repo = ProductRepository(products)
+        return _repo
+
+
+def _on_write(key, records):
+    global _repo
+    if key != "products":
+        return
+    with _repo_lock:
+        if _repo is None:
+            return
+        if records is None:
+            _repo = None
+        else:
+            _repo.apply(records)
+
+
+add_write_listener(_on_write)
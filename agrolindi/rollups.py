@@ -0,0 +1,125 @@
+from agrolindi.storage import ROLLUPS_BUILT, add_write_listener, load_cached, run_transaction
+
+# --- PËRMBLEDHJET E SHITJEVE (ROLLUPS) ---
+# Totale të parallogaritura për ditë, produkt, kategori dhe lloj pagese.
+# Checkout-i i përditëson në të njëjtin transaksion me shitjen, ndaj
+# Dashboard-i nuk ka nevojë të lexojë historinë e plotë të shitjeve.
+
+DIMENSIONS = ("day", "product", "category", "payment")
+
+
+def _empty(dim, key):
+    return {"id": f"{dim}:{key}", "dim": dim, "key": key,
+            "revenue": 0.0, "cogs": 0.0, "quantity": 0, "orders": 0}
+
+
+def sale_contributions(sale, category_of):
+    # Kontributi i një shitjeje për çdo rresht përmbledhjeje: id -> delta
+    deltas = {}
+
+    def add(dim, key, revenue, cogs, quantity):
+        row = deltas.get(f"{dim}:{key}")
+        if row is None:
+            row = deltas[f"{dim}:{key}"] = _empty(dim, key)
+            row["orders"] = 1
+        row["revenue"] += revenue
+        row["cogs"] += cogs
+        row["quantity"] += quantity
+
+    cogs = sale.get('cogs') or 0.0
+    quantity = sum(item['quantity'] for item in sale['items'])
+    add("day", sale['date'][:10], sale['total'], cogs, quantity)
+    add("payment", sale.get('type', 'cash'), sale['total'], cogs, quantity)
+    for item in sale['items']:
+        line_cost = item.get('cost') or 0.0
+        add("product", item['product_id'], item['total'], line_cost, item['quantity'])
+        add("category", category_of(item['product_id']), item['total'], line_cost, item['quantity'])
+    return deltas
+
+
+def _merge(row, delta):
+    row["revenue"] += delta["revenue"]
+    row["cogs"] += delta["cogs"]
+    row["quantity"] += delta["quantity"]
+    row["orders"] += delta["orders"]
+
+
+def apply_sale(tx, sale, products):
+    # Thirret brenda transaksionit të checkout-it; products: id -> produkt
+    def category_of(product_id):
+        p = products.get(product_id)
+        return p.get('category', '') if p else ''
+
+    if tx.get("rollups", ROLLUPS_BUILT) is None:
+        # Përmbledhjet s'janë ndërtuar ende (p.sh. pas migrimit): rindërtimi e
+        # përfshin edhe këtë shitje, kurse një rresht i vetëm do ta fshihte historinë
+        return
+    for rid, delta in sale_contributions(sale, category_of).items():
+        row = tx.get("rollups", rid) or _empty(delta["dim"], delta["key"])
+        _merge(row, delta)
+        tx.update("rollups", row)
+
+
+def rebuild_rollups(sales=None, products=None):
+    # Rindërtim i plotë nga shitjet bruto, në një transaksion me leximin: një
+    # shitje e kryer gjatë rindërtimit s'humbet (SQLite e pret, JSON e përsërit)
+    def rebuild(tx):
+        by_id = {p['id']: p for p in (tx.load("products", []) if products is None else products)}
+
+        def category_of(product_id):
+            p = by_id.get(product_id)
+            return p.get('category', '') if p else ''
+
+        rows = {}
+        # Periudhat e mbyllura: shitjet janë në arkiv, kontributi i tyre në përmbledhje
+        for period in tx.load("periods", []):
+            for rid, delta in period.get("rollups", {}).items():
+                if rid in rows:
+                    _merge(rows[rid], delta)
+                else:
+                    rows[rid] = dict(delta)
+        for sale in (tx.load("sales", []) if sales is None else sales):
+            for rid, delta in sale_contributions(sale, category_of).items():
+                if rid in rows:
+                    _merge(rows[rid], delta)
+                else:
+                    rows[rid] = delta
+        for row in list(tx.load("rollups", [])):
+            if row["id"] not in rows and row["id"] != ROLLUPS_BUILT:
+                tx.delete("rollups", row["id"])
+        for row in rows.values():
+            tx.update("rollups", row)
+        tx.update("rollups", {"id": ROLLUPS_BUILT, "dim": "meta", "key": None})
+        return rows
+
+    return run_transaction(rebuild)
+
+
+_stale = False
+
+
+def get_rollups(dim):
+    # Rreshtat e një dimensioni; rindërtohen vetëm nëse s'janë ndërtuar nga
+    # historia (pa shënjues, edhe nga një proces tjetër) ose shitjet janë
+    # rishkruar të tëra (save_data)
+    global _stale
+    rows = load_cached("rollups")
+    if rows is None or _stale or not any(r["id"] == ROLLUPS_BUILT for r in rows):
+        _stale = False
+        rebuild_rollups()
+        rows = load_cached("rollups") or []
+    return [r for r in rows if r["dim"] == dim]
+
+
+def _on_write(key, records):
+    global _stale
+    if key == "sales" and records is None:
+        _stale = True
+
+
+add_write_listener(_on_write)
+
+
+if __name__ == "__main__":
+    # python -m agrolindi.rollups  -> rindërton përmbledhjet nga shitjet
+    print(f"{len(rebuild_rollups())} rreshta përmbledhjeje")
@@ -0,0 +1,109 @@
+from datetime import datetime
+
+from agrolindi import metrics
+from agrolindi.inventory import apply_fifo
+from agrolindi.products import get_repository
+from agrolindi.rollups import apply_sale
+from agrolindi.storage import new_id, run_transaction
+
+
+# --- SHITJA (CHECKOUT) ---
+# Të gjitha rreshtat e shportës, fatura dhe borxhi shkruhen në një transaksion:
+# nuk ka më dritare ku shitja është ruajtur por stoku jo.
+def _sell(tx, cart, now, is_debt=False, debtor_name="", is_agreement=False, due_date=None):
+    # Stoku kontrollohet për të gjithë shportën para se të preket gjë, që një
+    # shportë e refuzuar të mos lërë gjurmë në transaksion (shih checkout_batch)
+    products = {}
+    needed = {}
+    for item in cart:
+        product = products.get(item['product_id'])
+        if product is None:
+            product = tx.get("products", item['product_id'])
+            if product is None:
+                raise ValueError(f"Produkti {item['product_id']} nuk ekziston!")
+            products[item['product_id']] = product
+        needed[product['id']] = needed.get(product['id'], 0) + item['quantity']
+        if needed[product['id']] > product['stock']:
+            raise ValueError(f"Nuk ka stok të mjaftueshëm për {product['name']}!")
+
+    lines = []
+    for item in cart:
+        # Kostoja e saktë (COGS) ruhet te rreshti i shitjes
+        cost, consumed = apply_fifo(products[item['product_id']], item['quantity'])
+        lines.append(dict(item, cost=cost, batches=consumed))
+
+    for product in products.values():
+        tx.update("products", product)
+
+    grand_total = float(sum(item['total'] for item in cart))
+    new_sale = {
+        "id": new_id(),
+        "date": now.isoformat(),
+        "items": lines,
+        "total": grand_total,
+        "cogs": sum(line['cost'] for line in lines),
+        "type": "debt" if is_debt else "cash"
+    }
+    tx.insert("sales", new_sale)
+    apply_sale(tx, new_sale, products)
+
+    if is_debt:
+        tx.insert("debts", {
+            "id": new_id(),
+            "personName": debtor_name,
+            "amount": grand_total,
+            "dateTaken": now.isoformat(),
+            "description": ", ".join([f"{i['quantity']}x {i['name']}" for i in cart]),
+            "isPaid": False,
+            "hasAgreement": is_agreement,
+            "paymentDueDate": due_date.isoformat() if due_date else None,
+            "history": []
+        })
+    return new_sale
+
+
+@metrics.instrument("checkout")
+def checkout(cart, is_debt=False, debtor_name="", is_agreement=False, due_date=None):
+    now = datetime.now()
+    # Përsëritet automatikisht nëse një arkë tjetër shkroi në të njëjtën kohë
+    return run_transaction(lambda tx: _sell(tx, cart, now, is_debt, debtor_name, is_agreement, due_date))
+
+
+@metrics.instrument("checkout_batch")
+def checkout_batch(orders):
+    # orders: [{"cart": [...], "is_debt", "debtor_name", "is_agreement", "due_date"}]
+    # Të gjitha shportat në një transaksion (një commit për grupin); një shportë
+    # pa stok refuzohet më vete pa i prekur të tjerat. Kthen [(shitja, gabimi)].
+    now = datetime.now()
+
+    def apply(tx):
+        results = []
+        for order in orders:
+            try:
+                sale = _sell(tx, order['cart'], now, order.get('is_debt', False), order.get('debtor_name', ""),
+                             order.get('is_agreement', False), order.get('due_date'))
+                results.append((sale, None))
+            except ValueError as e:
+                results.append((None, str(e)))
+        return results
+
+    return run_transaction(apply)
+
+
+@metrics.instrument("calculate_profit")
+def calculate_profit(sale_items):
+    # Shitjet e reja kanë koston e saktë FIFO te çdo rresht ('cost').
+    # Për shitjet e vjetra përdorim 'purchasePrice' aktual të produktit.
+    repo = get_repository()
+    cost = 0
+    revenue = 0
+    for item in sale_items:
+        if 'cost' in item:
+            revenue += item['price'] * item['quantity']
+            cost += item['cost']
+            continue
+        prod = repo.get(item['product_id'])
+        if prod:
+            revenue += item['price'] * item['quantity']
+            cost += prod.get('purchasePrice', 0) * item['quantity']
+    return revenue, cost, revenue - cost
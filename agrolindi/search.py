@@ -0,0 +1,179 @@
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+
+from agrolindi.products import get_repository
+from agrolindi.storage import add_write_listener
+
+# --- INDEKSI I KËRKIMIT TË PRODUKTEVE ---
+# Indeks prefiksi (fjalët e renditura) + trigrama mbi emrin, kategorinë dhe
+# përshkrimin, me palosje të shkronjave (ë -> e, ç -> c). Rezultatet janë
+# id produktesh të renditura sipas përputhjes, të ndara në faqe.
+
+# Pesha sipas fushës: përputhja në emër vlen më shumë
+FIELD_WEIGHTS = {"name": 3.0, "category": 1.5, "description": 1.0}
+
+
+def fold(text):
+    text = unicodedata.normalize("NFKD", str(text or "").lower())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return " ".join(text.split())
+
+
+def tokens(text):
+    return [t for t in "".join(ch if ch.isalnum() else " " for ch in fold(text)).split() if t]
+
+
+def trigrams(token):
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class ProductSearchIndex:
+    def __init__(self, products=()):
+        self.postings = {}  # fjala -> {id: pesha}
+        self.words = []  # fjalët e renditura për kërkim prefiksi
+        self.grams = {}  # trigrami -> set(fjalë)
+        self.docs = {}  # id -> (fjalët, emri i palosur, produkti)
+        self._by_name = None  # id-të sipas emrit, për pyetjen bosh
+        # Arkat kërkojnë ndërsa furnizimet përditësojnë indeksin
+        self._lock = threading.RLock()
+        for p in products:
+            self.apply_one(p)
+
+    def _remove(self, product_id):
+        doc = self.docs.pop(product_id, None)
+        if doc is None:
+            return
+        for word in doc[0]:
+            posting = self.postings.get(word)
+            if posting is None:
+                continue
+            posting.pop(product_id, None)
+            if not posting:
+                del self.postings[word]
+                i = bisect_left(self.words, word)
+                if i < len(self.words) and self.words[i] == word:
+                    self.words.pop(i)
+                for g in trigrams(word):
+                    self.grams.get(g, set()).discard(word)
+
+    def apply_one(self, p):
+        with self._lock:
+            self._apply_one(p)
+
+    def _apply_one(self, p):
+        self._by_name = None
+        self._remove(p['id'])
+        weights = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            for word in tokens(p.get(field, "")):
+                weights[word] = max(weights.get(word, 0), weight)
+        for word, weight in weights.items():
+            posting = self.postings.get(word)
+            if posting is None:
+                posting = self.postings[word] = {}
+                insort(self.words, word)
+                for g in trigrams(word):
+                    self.grams.setdefault(g, set()).add(word)
+            posting[p['id']] = weight
+        self.docs[p['id']] = (set(weights), fold(p.get('name', "")), p)
+
+    def apply(self, products):
+        for p in products:
+            self.apply_one(p)
+
+    def _prefix_words(self, prefix):
+        i = bisect_left(self.words, prefix)
+        while i < len(self.words) and self.words[i].startswith(prefix):
+            yield self.words[i]
+            i += 1
+
+    def _fuzzy_words(self, token):
+        # Fjalë të ngjashme sipas trigramave (gabime shtypi, pjesë fjalësh)
+        grams = trigrams(token)
+        counts = {}
+        for g in grams:
+            for word in self.grams.get(g, ()):
+                counts[word] = counts.get(word, 0) + 1
+        for word, shared in counts.items():
+            similarity = shared / len(grams | trigrams(word))
+            if similarity >= 0.3:
+                yield word, similarity
+
+    def search(self, query, page=0, page_size=20, in_stock=False):
+        # Kthen (id-të e faqes, numri total i rezultateve)
+        with self._lock:
+            return self._search(query, page, page_size, in_stock)
+
+    def _search(self, query, page, page_size, in_stock):
+        q_tokens = tokens(query)
+        if not q_tokens:
+            if self._by_name is None:
+                self._by_name = sorted(self.docs, key=lambda pid: self.docs[pid][1])
+            ids = [pid for pid in self._by_name if not in_stock or self.docs[pid][2].get('stock', 0) > 0]
+            return ids[page * page_size:(page + 1) * page_size], len(ids)
+
+        scores = None
+        for token in q_tokens:
+            token_scores = {}
+            for word in self._prefix_words(token):
+                exact = 1.0 if word == token else 0.8
+                for pid, weight in self.postings[word].items():
+                    token_scores[pid] = max(token_scores.get(pid, 0), weight * exact)
+            if not token_scores:
+                for word, similarity in self._fuzzy_words(token):
+                    for pid, weight in self.postings[word].items():
+                        token_scores[pid] = max(token_scores.get(pid, 0), weight * similarity * 0.5)
+            # Të gjitha fjalët e pyetjes duhet të përputhen
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {pid: s + token_scores[pid] for pid, s in scores.items() if pid in token_scores}
+            if not scores:
+                return [], 0
+
+        folded = fold(query)
+        ranked = []
+        for pid, score in scores.items():
+            name, p = self.docs[pid][1], self.docs[pid][2]
+            if in_stock and p.get('stock', 0) <= 0:
+                continue
+            if name.startswith(folded):
+                score += 2.0
+            ranked.append((-score, name, pid))
+        ranked.sort()
+        ids = [pid for _, _, pid in ranked]
+        return ids[page * page_size:(page + 1) * page_size], len(ids)
+
+
+_index = None
+_index_source = None
+_index_lock = threading.Lock()
+
+
+def get_search_index():
+    # Ndërtohet një herë për çdo repozitor produktesh; pastaj përditësohet në vend
+    global _index, _index_source
+    repo = get_repository()
+    with _index_lock:
+        if _index is None or _index_source is not repo:
+            _index = ProductSearchIndex(repo)
+            _index_source = repo
+        return _index
+
+
+def _on_write(key, records):
+    global _index
+    if key != "products":
+        return
+    with _index_lock:
+        if _index is None:
+            return
+        if records is None:
+            _index = None
+        else:
+            _index.apply(records)
+
+
+add_write_listener(_on_write)
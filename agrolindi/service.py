@@ -0,0 +1,137 @@
+from datetime import date
+
+from agrolindi.debts import record_payment
+from agrolindi.products import get_repository
+from agrolindi.sales import checkout, checkout_batch
+from agrolindi.search import get_search_index
+from agrolindi.supplies import add_supply
+
+# --- SHËRBIMET E DYQANIT (PA STREAMLIT) ---
+# Operacionet kryesore me hyrje të thjeshta (id, barkod, sasi), që i
+# përdorin njësoj kasa në Streamlit, skanerët dhe API-ja HTTP. Çmimet merren
+# gjithmonë nga katalogu, jo nga klienti; gabimet e hyrjes janë ValueError.
+
+MAX_QUANTITY = 100000
+
+
+def find_product(code):
+    # Id, barkod ose emër i plotë
+    repo = get_repository()
+    code = str(code).strip()
+    return repo.get(code) or repo.find_by_barcode(code) or repo.find_by_name(code)
+
+
+def product_info(p):
+    return {"id": p['id'], "name": p['name'], "barcode": p.get('barcode'), "category": p.get('category', ''),
+            "price": p['price'], "stock": p['stock']}
+
+
+def search_products(query="", limit=20, in_stock=False):
+    repo = get_repository()
+    ids, found = get_search_index().search(query, page_size=limit, in_stock=in_stock)
+    return [product_info(repo.get(pid)) for pid in ids], found
+
+
+def _quantity(value):
+    # Numër i plotë pozitiv (skanerët e dërgojnë edhe si tekst)
+    if isinstance(value, bool) or isinstance(value, float) and not value.is_integer():
+        raise ValueError(f"Sasi e pavlefshme: {value!r}")
+    try:
+        quantity = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Sasi e pavlefshme: {value!r}")
+    if not 0 < quantity <= MAX_QUANTITY:
+        raise ValueError(f"Sasi e pavlefshme: {value!r}")
+    return quantity
+
+
+def cart_line(product, quantity):
+    # Një rresht shporte me çmimin aktual të produktit
+    return {
+        "product_id": product['id'],
+        "name": product['name'],
+        "price": product['price'],
+        "quantity": quantity,
+        "total": quantity * product['price'],
+    }
+
+
+def build_cart(items):
+    # items: [{"product_id" | "barcode" | "code", "quantity"}]; i njëjti produkt bashkohet
+    if not items or not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        raise ValueError("Shporta është bosh!")
+    quantities = {}
+    products = {}
+    for item in items:
+        code = item.get('product_id') or item.get('barcode') or item.get('code')
+        product = find_product(code) if code else None
+        if product is None:
+            raise ValueError(f"Produkti {code} nuk u gjet!")
+        products[product['id']] = product
+        quantities[product['id']] = quantities.get(product['id'], 0) + _quantity(item.get('quantity', 1))
+    return [cart_line(products[pid], quantity) for pid, quantity in quantities.items()]
+
+
+def _order(payload):
+    # Shporta + të dhënat e borxhit nga një kërkesë
+    debtor = (payload.get('debtor_name') or "").strip()
+    due = payload.get('due_date')
+    if due is not None and not isinstance(due, str):
+        raise ValueError(f"Data e pagesës e pavlefshme: {due!r}")
+    try:
+        due = date.fromisoformat(due) if due else None
+    except ValueError:
+        raise ValueError(f"Data e pagesës e pavlefshme: {due!r}")
+    return {
+        "cart": build_cart(payload.get('items')),
+        "is_debt": bool(debtor),
+        "debtor_name": debtor,
+        "is_agreement": bool(payload.get('is_agreement')),
+        "due_date": due,
+    }
+
+
+def sell(payload):
+    order = _order(payload)
+    return checkout(order.pop("cart"), **order)
+
+
+def sell_batch(payloads):
+    # Shportat e pavlefshme refuzohen më vete; të tjerat shkruhen në një transaksion
+    results = [None] * len(payloads)
+    orders = []
+    positions = []
+    for i, payload in enumerate(payloads):
+        try:
+            orders.append(_order(payload))
+            positions.append(i)
+        except ValueError as e:
+            results[i] = (None, str(e))
+    for i, result in zip(positions, checkout_batch(orders) if orders else []):
+        results[i] = result
+    return results
+
+
+def receive(payload):
+    item_name = (payload.get('item_name') or "").strip()
+    if not item_name:
+        raise ValueError("Emri i mallit mungon!")
+    try:
+        purchase_price = float(payload['purchase_price'])
+        selling_price = float(payload.get('selling_price') or purchase_price)
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("Çmim i pavlefshëm!")
+    if purchase_price < 0 or selling_price < 0:
+        raise ValueError("Çmim i pavlefshëm!")
+    return add_supply(payload.get('supplier', ""), item_name, payload.get('category', ""),
+                      _quantity(payload.get('quantity')), purchase_price, selling_price)
+
+
+def pay_debt(debt_id, amount):
+    try:
+        amount = float(amount)
+    except (TypeError, ValueError):
+        raise ValueError("Shumë e pavlefshme!")
+    if amount <= 0:
+        raise ValueError("Shumë e pavlefshme!")
+    return record_payment(debt_id, amount)
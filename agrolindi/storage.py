@@ -0,0 +1,673 @@
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: mbeten vetëm bravat brenda procesit
+    fcntl = None
+
+from agrolindi import metrics
+from agrolindi.cache import DataCache
+
+# --- MOTORI I RUAJTJES (STORAGE) ---
+# load_data/save_data mbajnë kontratën e vjetër (lista e plotë e regjistrimeve),
+# ndërsa insert_record/update_record shkruajnë vetëm një regjistrim.
+
+DATA_DIR = os.environ.get("AGROLINDI_DATA_DIR", "data")
+BACKEND = os.environ.get("AGROLINDI_STORAGE", "sqlite")
+
+# Koleksionet dhe fusha që shërben si çelës unik
+COLLECTIONS = {
+    "products": "id",
+    "sales": "id",
+    "supplies": "id",
+    "debts": "id",
+    "categories": "name",
+    "rollups": "id",
+    "periods": "id",
+    "forecast": "id",
+}
+# Rreshti-shënjues në "rollups": përmbledhjet janë ndërtuar nga historia e plotë
+ROLLUPS_BUILT = "meta:built"
+
+
+# Koleksionet me datë ndahen në periudha mujore (YYYY-MM) me indeks sipas datës
+DATED = {"sales": "date", "supplies": "date"}
+
+
+def record_key(key, record):
+    return str(record[COLLECTIONS[key]])
+
+
+def _row(key, record):
+    row = (record_key(key, record), json.dumps(record))
+    if key in DATED:
+        date = record.get(DATED[key]) or ""
+        row += (date, date[:7])
+    return row
+
+
+def _insert_sql(key, upsert=False):
+    cols = "id, data, date, period" if key in DATED else "id, data"
+    marks = ", ".join("?" for _ in cols.split(", "))
+    sql = f"INSERT INTO {key} ({cols}) VALUES ({marks})"
+    if upsert:
+        sets = ", ".join(f"{c} = excluded.{c}" for c in cols.split(", ")[1:])
+        sql += f" ON CONFLICT(id) DO UPDATE SET {sets}"
+    return sql
+
+
+# Numërues shkrimesh brenda procesit; rritet pas çdo shkrimi të suksesshëm
+_versions = {}
+_versions_lock = threading.Lock()
+
+
+_listeners = []
+
+
+def add_write_listener(fn):
+    # fn(key, records): records janë regjistrimet e shkruara, ose None kur
+    # koleksioni është rishkruar i tëri (save_data)
+    _listeners.append(fn)
+
+
+def bump_version(key, records=None, old_stored=None, new_stored=None):
+    with _versions_lock:
+        old_local = _versions.get(key, 0)
+        _versions[key] = old_local + 1
+    if records is None:
+        data_cache.invalidate(key)
+    else:
+        # Shkrim i pjesshëm: cache-i përditësohet në vend, pa rilexim të plotë
+        data_cache.apply(key, records, old_local, old_local + 1, old_stored, new_stored)
+    for fn in _listeners:
+        fn(key, records)
+
+
+def local_version(key):
+    return _versions.get(key, 0)
+
+
+_last_id = 0.0
+_id_lock = threading.Lock()
+
+
+def new_id():
+    # Id në formatin e vjetër (timestamp), por unike edhe për dy arka në të njëjtin mikrosekond
+    global _last_id
+    with _id_lock:
+        ts = max(time.time(), _last_id + 0.000001)
+        _last_id = ts
+    return f"{ts:.6f}"
+
+
+class ConflictError(Exception):
+    # Një koleksion i lexuar nga transaksioni ndryshoi para commit-it
+    def __init__(self, key, keys=()):
+        super().__init__(key)
+        self.keys = set(keys)
+
+
+# Brava për koleksion brenda procesit (një për çdo skedar)
+_collection_locks = {}
+_collection_locks_guard = threading.Lock()
+_held = threading.local()
+
+
+def _thread_lock(name):
+    with _collection_locks_guard:
+        lock = _collection_locks.get(name)
+        if lock is None:
+            lock = _collection_locks[name] = threading.RLock()
+        return lock
+
+
+class JsonBackend:
+    # Backend-i origjinal: një skedar JSON për koleksion, rishkruhet i tëri
+    name = "json"
+
+    def __init__(self, data_dir=DATA_DIR):
+        self.data_dir = data_dir
+        os.makedirs(data_dir, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.data_dir, f"{key}.json")
+
+    def exists(self, key):
+        return os.path.exists(self.path(key))
+
+    def load(self, key, default=None):
+        if self.exists(key):
+            with open(self.path(key), 'r') as f:
+                if metrics.enabled:
+                    metrics.count_bytes(read=os.fstat(f.fileno()).st_size)
+                return json.load(f)
+        return default
+
+    def load_since(self, key, seq):
+        # Renditja në skedar shërben si seq (1, 2, ...)
+        data = self.load(key, [])
+        return [(i + 1, r) for i, r in enumerate(data) if i + 1 > seq]
+
+    def generation(self, key):
+        # Rritet vetëm kur fshihen regjistrime (mbyllja e periudhave), që
+        # lexuesit në procese të tjera (snapshot-i) të rindërtohen
+        try:
+            with open(os.path.join(self.data_dir, f"{key}.generation")) as f:
+                return int(f.read() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def bump_generation(self, key):
+        path = os.path.join(self.data_dir, f"{key}.generation")
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
+            f.write(str(self.generation(key) + 1))
+        os.replace(tmp, path)
+
+    def query_range(self, key, start, end):
+        # Pa ndarje në periudha: skanim i plotë (backend-i i vjetër)
+        field = DATED[key]
+        return [r for r in self.load(key, []) if start <= r[field] < end]
+
+    def list_periods(self, key):
+        field = DATED[key]
+        return sorted({r[field][:7] for r in self.load(key, []) if r.get(field)})
+
+    @contextmanager
+    def locked(self, keys):
+        # Brava për koleksion: RLock brenda procesit + flock mes proceseve.
+        # Merren gjithmonë sipas renditjes alfabetike, që të mos ketë deadlock.
+        held = _held.__dict__.setdefault("paths", set())
+        with ExitStack() as stack:
+            for key in sorted(set(keys)):
+                lock_path = os.path.abspath(self.path(key) + ".lock")
+                if lock_path in held:
+                    continue  # e mban tashmë kjo fije
+                stack.enter_context(_thread_lock(lock_path))
+                if fcntl is not None:
+                    f = stack.enter_context(open(lock_path, 'a'))
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                    stack.callback(fcntl.flock, f, fcntl.LOCK_UN)
+                held.add(lock_path)
+                stack.callback(held.discard, lock_path)
+            yield
+
+    def token(self, key):
+        # Versioni optimist: numëruesi lokal + gjendja e skedarit
+        return (local_version(key), self.stored_version(key))
+
+    def _write(self, key, data, records=None):
+        # Shkrim atomik: skedar i përkohshëm + rename, kurrë skedar gjysmak.
+        # records: regjistrimet e ndryshuara (transaksion pa fshirje), që
+        # lexuesit të përditësohen në vend, pa rindërtim të plotë
+        old = self.stored_version(key) if records is not None else None
+        tmp = f"{self.path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(data, f, indent=4)
+            if metrics.enabled:
+                metrics.count_bytes(written=f.tell())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path(key))
+        if records is None:
+            bump_version(key)
+        else:
+            bump_version(key, records, old, self.stored_version(key))
+
+    def save(self, key, data):
+        with self.locked([key]):
+            self._write(key, data)
+
+    def stored_version(self, key):
+        # Ndryshimet nga procese të tjera dallohen nga mtime/madhësia
+        try:
+            st = os.stat(self.path(key))
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def get(self, key, record_id):
+        return next((r for r in self.load(key, []) if record_key(key, r) == str(record_id)), None)
+
+    def insert(self, key, record):
+        run_transaction(lambda tx: tx.insert(key, record), backend=self)
+
+    def update(self, key, record):
+        run_transaction(lambda tx: tx.update(key, record), backend=self)
+
+    @contextmanager
+    def transaction(self, lock_keys=()):
+        # lock_keys: pas konflikteve të përsëritura, koleksionet bllokohen që
+        # në fillim (pesimist), që transaksioni të mos mbetet pa u kryer
+        with self.locked(lock_keys):
+            tx = JsonTransaction(self)
+            yield tx
+            tx.commit()
+
+
+class JsonTransaction:
+    # Ngarkon çdo koleksion vetëm një herë dhe e shkruan vetëm në fund
+    def __init__(self, backend):
+        self.backend = backend
+        self.data = {}
+        self.seen = {}
+        self.dirty = set()
+        self.index = {}  # koleksioni -> {id: pozicioni}, për get/update pa skanim
+        self.written = {}
+        self.deleted = set()
+
+    def _rows(self, key):
+        if key not in self.data:
+            self.seen[key] = self.backend.token(key)
+            self.data[key] = self.backend.load(key, [])
+        return self.data[key]
+
+    def load(self, key, default=None):
+        if key not in self.data and not self.backend.exists(key):
+            return default
+        return self._rows(key)
+
+    def _positions(self, key):
+        rows = self._rows(key)
+        if key not in self.index:
+            positions = self.index[key] = {}
+            for i, r in enumerate(rows):
+                positions.setdefault(record_key(key, r), i)
+        return self.index[key]
+
+    def get(self, key, record_id):
+        i = self._positions(key).get(str(record_id))
+        return None if i is None else self.data[key][i]
+
+    def insert(self, key, record):
+        rows = self._rows(key)
+        if key in self.index:
+            self.index[key][record_key(key, record)] = len(rows)
+        rows.append(record)
+        self._mark(key, record)
+
+    def update(self, key, record):
+        rows = self._rows(key)
+        positions = self._positions(key)
+        rid = record_key(key, record)
+        if rid in positions:
+            rows[positions[rid]] = record
+        else:
+            positions[rid] = len(rows)
+            rows.append(record)
+        self._mark(key, record)
+
+    def _mark(self, key, record):
+        self.dirty.add(key)
+        self.written.setdefault(key, {})[record_key(key, record)] = record
+
+    def delete(self, key, record_id):
+        i = self._positions(key).get(str(record_id))
+        if i is None:
+            return
+        del self.data[key][i]
+        # Pozicionet pas fshirjes ndryshojnë: indeksi rindërtohet kur duhet
+        self.index.pop(key, None)
+        self.dirty.add(key)
+        self.deleted.add(key)
+
+    def commit(self):
+        if not self.dirty:
+            return
+        with self.backend.locked(self.data):
+            # Kontrolli optimist: asnjë koleksion i lexuar s'duhet të ketë ndryshuar
+            for key, token in self.seen.items():
+                if self.backend.token(key) != token:
+                    raise ConflictError(key, self.data)
+            for key in self.deleted:
+                self.backend.bump_generation(key)
+            for key in self.dirty:
+                # Pa fshirje: lexuesit marrin vetëm regjistrimet e shkruara
+                records = None if key in self.deleted else list(self.written[key].values())
+                self.backend._write(key, self.data[key], records)
+
+
+class SqliteBackend:
+    # SQLite në modalitetin WAL: çdo regjistrim është një rresht më vete,
+    # kështu që një shitje e re nuk rishkruan historinë.
+    name = "sqlite"
+
+    def __init__(self, path=None, data_dir=DATA_DIR):
+        self.data_dir = data_dir
+        os.makedirs(data_dir, exist_ok=True)
+        self.path = path or os.path.join(data_dir, "agrolindi.db")
+        self._local = threading.local()
+        # SQLite bllokon të gjithë bazën për shkrim; brenda procesit shkrimtarët
+        # presin në radhë këtu në vend që të bëjnë polling me busy_timeout
+        self._write_lock = threading.Lock()
+        self._init_schema()
+
+    @property
+    def conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self):
+        c = self.conn
+        c.execute("CREATE TABLE IF NOT EXISTS collections (name TEXT PRIMARY KEY, version INTEGER NOT NULL DEFAULT 0)")
+        c.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        for key in COLLECTIONS:
+            c.execute(
+                f"CREATE TABLE IF NOT EXISTS {key} ("
+                "seq INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "id TEXT UNIQUE NOT NULL, "
+                "data TEXT NOT NULL)"
+            )
+        for key, field in DATED.items():
+            cols = [r[1] for r in c.execute(f"PRAGMA table_info({key})")]
+            if "date" not in cols:
+                # Baza të krijuara para ndarjes në periudha: shto kolonat dhe mbushi
+                c.execute(f"ALTER TABLE {key} ADD COLUMN date TEXT")
+                c.execute(f"ALTER TABLE {key} ADD COLUMN period TEXT")
+                c.execute(f"UPDATE {key} SET date = json_extract(data, '$.{field}')")
+                c.execute(f"UPDATE {key} SET period = substr(date, 1, 7)")
+            c.execute(f"CREATE INDEX IF NOT EXISTS idx_{key}_period_date ON {key} (period, date)")
+            c.execute(f"CREATE INDEX IF NOT EXISTS idx_{key}_date ON {key} (date)")
+
+    def _touch(self, key):
+        # Shënon që koleksioni ekziston dhe rrit versionin e tij
+        old = self.stored_version(key)
+        self.conn.execute(
+            "INSERT INTO collections (name, version) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET version = version + 1",
+            (key,),
+        )
+        return old, (old or 0) + 1
+
+    def exists(self, key):
+        row = self.conn.execute("SELECT 1 FROM collections WHERE name = ?", (key,)).fetchone()
+        return row is not None
+
+    def load(self, key, default=None):
+        if not self.exists(key):
+            return default
+        rows = self.conn.execute(f"SELECT data FROM {key} ORDER BY seq").fetchall()
+        if metrics.enabled:
+            metrics.count_bytes(read=sum(len(r[0]) for r in rows))
+        return [json.loads(r[0]) for r in rows]
+
+    def save(self, key, data):
+        c = self.conn
+        with self._write_lock:
+            c.execute("BEGIN IMMEDIATE")
+            try:
+                c.execute(f"DELETE FROM {key}")
+                rows = [_row(key, r) for r in data]
+                if metrics.enabled:
+                    metrics.count_bytes(written=sum(len(r[1]) for r in rows))
+                c.executemany(_insert_sql(key), rows)
+                # Gjenerata rritet në çdo rishkrim të plotë (seq nuk përsëritet)
+                self.set_meta(f"generation:{key}", str(self.generation(key) + 1))
+                self._touch(key)
+                c.execute("COMMIT")
+            except Exception:
+                c.execute("ROLLBACK")
+                raise
+            bump_version(key)
+
+    def stored_version(self, key):
+        row = self.conn.execute("SELECT version FROM collections WHERE name = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def get(self, key, record_id):
+        row = self.conn.execute(f"SELECT data FROM {key} WHERE id = ?", (str(record_id),)).fetchone()
+        if row and metrics.enabled:
+            metrics.count_bytes(read=len(row[0]))
+        return json.loads(row[0]) if row else None
+
+    def load_since(self, key, seq):
+        # Regjistrimet e shtuara pas seq-it të dhënë, sipas renditjes së futjes
+        rows = self.conn.execute(f"SELECT seq, data FROM {key} WHERE seq > ? ORDER BY seq", (seq,)).fetchall()
+        if metrics.enabled:
+            metrics.count_bytes(read=sum(len(r[1]) for r in rows))
+        return [(r[0], json.loads(r[1])) for r in rows]
+
+    def generation(self, key):
+        return int(self.get_meta(f"generation:{key}", "0"))
+
+    def query_range(self, key, start, end):
+        # Lexon vetëm rreshtat e intervalit [start, end) përmes indeksit të datës
+        rows = self.conn.execute(
+            f"SELECT data FROM {key} WHERE date >= ? AND date < ? ORDER BY date",
+            (start, end),
+        ).fetchall()
+        if metrics.enabled:
+            metrics.count_bytes(read=sum(len(r[0]) for r in rows))
+        return [json.loads(r[0]) for r in rows]
+
+    def list_periods(self, key):
+        # Periudhat (YYYY-MM) që kanë regjistrime, nga indeksi
+        rows = self.conn.execute(f"SELECT DISTINCT period FROM {key} WHERE period IS NOT NULL ORDER BY period")
+        return [r[0] for r in rows.fetchall()]
+
+    def insert(self, key, record):
+        run_transaction(lambda tx: tx.insert(key, record), backend=self)
+
+    def update(self, key, record):
+        run_transaction(lambda tx: tx.update(key, record), backend=self)
+
+    @contextmanager
+    def transaction(self, lock_keys=()):
+        # Një transaksion i vetëm: ose shkruhet gjithçka, ose asgjë.
+        # BEGIN IMMEDIATE merr bravën e shkrimit që në fillim, kështu që
+        # leximet brenda transaksionit s'mund të vjetrohen para commit-it.
+        c = self.conn
+        with self._write_lock:
+            c.execute("BEGIN IMMEDIATE")
+            try:
+                tx = SqliteTransaction(self)
+                yield tx
+                for key in tx.deleted:
+                    # Fshirja s'mund të zbatohet në vend: lexuesit (snapshot-i) rindërtohen
+                    self.set_meta(f"generation:{key}", str(self.generation(key) + 1))
+                stamps = {key: self._touch(key) for key in tx.dirty}
+                c.execute("COMMIT")
+            except BaseException:
+                c.execute("ROLLBACK")
+                raise
+            for key, (old, new) in stamps.items():
+                if key in tx.deleted:
+                    bump_version(key)
+                else:
+                    bump_version(key, list(tx.written[key].values()), old, new)
+
+    def get_meta(self, key, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        self.conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+
+
+class SqliteTransaction:
+    def __init__(self, backend):
+        self.backend = backend
+        self.conn = backend.conn
+        self.dirty = set()
+        self.written = {}
+        self.deleted = set()
+
+    def load(self, key, default=None):
+        return self.backend.load(key, default)
+
+    def get(self, key, record_id):
+        return self.backend.get(key, record_id)
+
+    def insert(self, key, record):
+        row = _row(key, record)
+        self.conn.execute(_insert_sql(key), row)
+        self._mark(key, record, row)
+
+    def update(self, key, record):
+        # Upsert: ruan renditjen (seq) nëse regjistrimi ekziston
+        row = _row(key, record)
+        self.conn.execute(_insert_sql(key, upsert=True), row)
+        self._mark(key, record, row)
+
+    def delete(self, key, record_id):
+        self.conn.execute(f"DELETE FROM {key} WHERE id = ?", (str(record_id),))
+        self.dirty.add(key)
+        self.deleted.add(key)
+
+    def _mark(self, key, record, row):
+        if metrics.enabled:
+            metrics.count_bytes(written=len(row[1]))
+        self.dirty.add(key)
+        self.written.setdefault(key, {})[record_key(key, record)] = record
+
+
+# --- MIGRIMI NGA JSON ---
+def migrate_json(backend, data_dir=DATA_DIR, force=False):
+    # Migrim një-herësh i skedarëve data/*.json në backend-in e ri.
+    # Skedarët JSON nuk fshihen; shënohen si të migruar në meta.
+    if not force and backend.get_meta("json_migrated"):
+        return {}
+    source = JsonBackend(data_dir)
+    migrated = {}
+    for key in COLLECTIONS:
+        if source.exists(key):
+            data = source.load(key, [])
+            if key == "products":
+                # Motori FIFO pret batch-et të renditura sipas datës
+                for p in data:
+                    p['batches'] = sorted(p.get('batches', []), key=lambda x: x['date'])
+            backend.save(key, data)
+            migrated[key] = len(data)
+    # Pa shënjues: përmbledhjet rindërtohen nga shitjet e migruara herën e parë që lexohen
+    backend.save("rollups", [])
+    backend.set_meta("json_migrated", "1")
+    return migrated
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+# Cache e përbashkët për të gjitha sesionet e procesit
+data_cache = DataCache(
+    max_bytes=int(os.environ.get("AGROLINDI_CACHE_MB", "64")) * 1024 * 1024,
+    recheck_seconds=float(os.environ.get("AGROLINDI_CACHE_RECHECK", "2")),
+    key_fn=record_key,
+)
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if BACKEND == "json":
+                    _backend = JsonBackend(DATA_DIR)
+                else:
+                    backend = SqliteBackend(data_dir=DATA_DIR)
+                    migrate_json(backend, DATA_DIR)
+                    _backend = backend
+    return _backend
+
+
+def set_backend(backend):
+    global _backend
+    _backend = backend
+    data_cache.invalidate()
+
+
+# Funksione për Load/Save
+# load_data kthen një listë të re, por regjistrimet brenda saj ndahen me cache-in:
+# para se të ndryshohet një regjistrim, merret kopja e vet me get_record.
+@metrics.instrument("load_data")
+def load_data(key, default=[]):
+    data = load_cached(key)
+    if data is None:
+        return default
+    return list(data)
+
+
+def load_cached(key):
+    # Lista e përbashkët e cache-it (vetëm për lexim), ose None
+    return data_cache.get(key, get_backend(), local_version(key))
+
+
+def cached_version(key):
+    # Versioni i listës që kthen load_cached (mund të mbetet deri në
+    # recheck_seconds pas backend-it), për cache-t e derivuara prej saj.
+    # Versionet merren para leximit, ndaj çelësi s'del kurrë më i ri se të dhënat.
+    fallback = (local_version(key), get_backend().stored_version(key))
+    load_cached(key)
+    return data_cache.version(key) or fallback
+
+
+@metrics.instrument("save_data")
+def save_data(key, data):
+    get_backend().save(key, data)
+
+
+def get_record(key, record_id):
+    return get_backend().get(key, record_id)
+
+
+def insert_record(key, record):
+    get_backend().insert(key, record)
+
+
+def update_record(key, record):
+    get_backend().update(key, record)
+
+
+def transaction():
+    return get_backend().transaction()
+
+
+@metrics.instrument("transaction")
+def run_transaction(fn, retries=8, backend=None):
+    # Ekzekuton fn(tx) në një transaksion; në konflikt (versioni optimist ose
+    # baza e zënë nga një proces tjetër) e përsërit me pritje të rastësishme.
+    # fn duhet të jetë e ripërsëritshme: lexon gjithçka nga tx.
+    backend = backend or get_backend()
+    lock_keys = set()
+    for attempt in range(retries + 1):
+        try:
+            with backend.transaction(lock_keys=lock_keys) as tx:
+                return fn(tx)
+        except (ConflictError, sqlite3.OperationalError) as e:
+            if isinstance(e, ConflictError) and attempt >= 2:
+                lock_keys |= e.keys
+            if isinstance(e, sqlite3.OperationalError) and "locked" not in str(e) and "busy" not in str(e):
+                raise
+            if attempt == retries:
+                raise
+            time.sleep(random.uniform(0, 0.01 * 2 ** attempt))
+
+
+@metrics.instrument("query_range")
+def query_range(key, start, end):
+    # Regjistrimet me datë në [start, end); start/end janë data ISO (YYYY-MM-DD)
+    return get_backend().query_range(key, start, end)
+
+
+def list_periods(key):
+    return get_backend().list_periods(key)
+
+
+if __name__ == "__main__":
+    # python -m agrolindi.storage  -> migron data/*.json në SQLite
+    result = migrate_json(SqliteBackend(data_dir=DATA_DIR), DATA_DIR, force=True)
+    for key, count in result.items():
+        print(f"{key}: {count} regjistrime")
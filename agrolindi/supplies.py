@@ -0,0 +1,191 @@
+import io
+import re
+from datetime import datetime
+
+from agrolindi.inventory import add_batch
+from agrolindi.products import get_repository, normalize_name
+from agrolindi.storage import new_id, run_transaction
+
+
+# --- FURNIZIMET ---
+# Furnizimi dhe përditësimi i stokut shkruhen në një transaksion; produkti
+# rilexohet brenda tij, që të mos humbasë një shitje e njëkohshme.
+def _receive(tx, now, supplier, item_name, category, quantity, purchase_price, selling_price, product_id=None):
+    # 1. Regjistro Supply
+    new_supply = {
+        "id": new_id(),
+        "date": now.isoformat(),
+        "supplier": supplier,
+        "itemName": item_name,
+        "category": category,
+        "purchasePrice": purchase_price,
+        "sellingPrice": selling_price,
+        "quantity": quantity
+    }
+    tx.insert("supplies", new_supply)
+
+    # 2. Update ose Krijo Produkt
+    new_batch = {
+        "id": f"batch_{new_id()}",
+        "date": now.isoformat(),
+        "quantity": quantity,
+        "cost": purchase_price
+    }
+    product = tx.get("products", product_id) if product_id else None
+    if product:
+        product['stock'] += quantity
+        product['price'] = selling_price
+        product['purchasePrice'] = purchase_price
+        add_batch(product, new_batch)
+    else:
+        product = {
+            "id": new_id(),
+            "name": item_name,
+            "category": category,
+            "price": selling_price,
+            "purchasePrice": purchase_price,
+            "stock": quantity,
+            "description": f"Furnizim nga {supplier}",
+            "batches": [new_batch]
+        }
+    tx.update("products", product)
+    return new_supply, product
+
+
+def add_supply(supplier, item_name, category, quantity, purchase_price, selling_price):
+    existing = get_repository().find_by_name(item_name)
+
+    def apply(tx):
+        new_supply, _ = _receive(tx, datetime.now(), supplier, item_name, category, quantity,
+                                 purchase_price, selling_price, existing['id'] if existing else None)
+        return new_supply
+
+    return run_transaction(apply)
+
+
+# --- IMPORTI I FLETËDËRGESËS (CSV / EXCEL) ---
+# E gjithë fletëdërgesa lexohet me pandas, përputhet me produktet me një
+# kalim të vetëm mbi indeksin e emrave dhe regjistrohet në një transaksion.
+
+# Emrat e pranuar të kolonave (të normalizuar) -> fusha
+COLUMN_ALIASES = {
+    "item": ("emri", "emri mallit", "malli", "produkti", "artikulli", "item", "name", "product"),
+    "category": ("kategoria", "category"),
+    "quantity": ("sasia", "sasi", "quantity", "qty"),
+    "purchase_price": ("çmimi blerjes", "cmimi blerjes", "kosto", "blerja", "purchase price", "cost"),
+    "selling_price": ("çmimi shitjes", "cmimi shitjes", "shitja", "selling price", "price"),
+}
+REQUIRED_COLUMNS = ("item", "quantity", "purchase_price")
+
+
+def parse_number(value, decimal=None):
+    # Numër si tekst -> tekst që e kupton pd.to_numeric: "2,5" -> "2.5",
+    # "1.234,50" -> "1234.50", "1,234.50" -> "1234.50". Me dy ndarës, dhjetori
+    # është i fundit; "." e vetme është mijëshe vetëm në skedarë me presje
+    # dhjetore (decimal=",") dhe kur pason një grup me saktësisht 3 shifra
+    if not isinstance(value, str):
+        return value
+    text = value.replace("€", "").replace(" ", "").replace("\xa0", "")
+    if "," in text and "." in text:
+        thousands = "." if text.rfind(",") > text.rfind(".") else ","
+    elif text.count(",") > 1 or text.count(".") > 1:
+        thousands = "," if "," in text else "."
+    elif "," in text:
+        thousands = "."
+    elif decimal == "," and re.fullmatch(r"[-+]?\d{1,3}\.\d{3}", text):
+        thousands = "."
+    else:
+        thousands = ","
+    return text.replace(thousands, "").replace(",", ".")
+
+
+def read_delivery(data, filename):
+    # data: bajtët e skedarit; kthen DataFrame me kolonat e njohura.
+    # pandas importohet vetëm kur importohet një fletëdërgesë
+    import pandas as pd
+
+    if filename.lower().endswith((".xlsx", ".xls")):
+        # Qelizat numerike vijnë si numra; vetëm ato tekst kalojnë nga parse_number
+        raw = pd.read_excel(io.BytesIO(data))
+    elif ";" in data.split(b"\n", 1)[0].decode("utf-8", errors="ignore"):
+        # Eksporti CSV i Excel-it: ";" mes kolonave; numrat lexohen si tekst,
+        # që presja/pika dhjetore të dallohen nga parse_number
+        raw = pd.read_csv(io.BytesIO(data), sep=";", dtype=str)
+    else:
+        raw = pd.read_csv(io.BytesIO(data), sep=None, engine="python", dtype=str)
+    lookup = {alias: field for field, aliases in COLUMN_ALIASES.items() for alias in aliases}
+    renamed = {}
+    for column in raw.columns:
+        field = lookup.get(normalize_name(column))
+        if field and field not in renamed.values():
+            renamed[column] = field
+    df = raw.rename(columns=renamed)[list(renamed.values())]
+    missing = [c for c in REQUIRED_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Mungojnë kolonat: {', '.join(missing)}")
+    if "category" not in df.columns:
+        df["category"] = ""
+    if "selling_price" not in df.columns:
+        df["selling_price"] = 0.0
+
+    df["item"] = df["item"].fillna("").astype(str).str.strip()
+    df["category"] = df["category"].fillna("").astype(str).str.strip()
+    numbers = ["quantity", "purchase_price", "selling_price"]
+    # Skedar me presje dhjetore (lokalja shqip): "1.200" është një mijë e dyqind
+    decimal = "," if df[numbers].apply(lambda c: c.astype(str).str.contains(",", regex=False)).any().any() else None
+    for column in numbers:
+        df[column] = pd.to_numeric(df[column].map(lambda v: parse_number(v, decimal)), errors="coerce")
+    # Rreshtat krejt bosh (p.sh. totali në fund të fletës) hiqen
+    df = df[(df["item"] != "") | df["quantity"].notna()].reset_index(drop=True)
+    return df[["item", "category", "quantity", "purchase_price", "selling_price"]]
+
+
+def match_delivery(df):
+    # Shton kolonat product_id, status dhe error; një kërkim hash për rresht
+    import pandas as pd
+
+    repo = get_repository()
+    df = df.copy()
+    keys = df["item"].map(normalize_name)
+    matched = keys.map(repo.by_name)
+    df["product_id"] = matched.map(lambda p: p['id'] if isinstance(p, dict) else None)
+    # Pa çmim shitjeje: mbahet ai ekzistues i produktit
+    current = matched.map(lambda p: p.get('price', 0.0) if isinstance(p, dict) else 0.0)
+    df["selling_price"] = df["selling_price"].where(df["selling_price"] > 0, current)
+    categories = matched.map(lambda p: p.get('category', '') if isinstance(p, dict) else '')
+    df["category"] = df["category"].where(df["category"] != "", categories)
+
+    error = pd.Series("", index=df.index)
+    error = error.mask(df["purchase_price"].isna() | (df["purchase_price"] < 0), "Çmim blerjeje i pavlefshëm")
+    error = error.mask(df["quantity"].isna() | (df["quantity"] <= 0), "Sasi e pavlefshme")
+    error = error.mask(df["item"] == "", "Mungon emri")
+    df["error"] = error
+    df["status"] = "Ekzistues"
+    df.loc[df["product_id"].isna(), "status"] = "I ri"
+    df.loc[df["error"] != "", "status"] = "Gabim"
+    return df
+
+
+def import_delivery(df, supplier):
+    # Të gjitha rreshtat e vlefshëm regjistrohen në një transaksion të vetëm
+    import pandas as pd
+
+    rows = df[df["status"] != "Gabim"]
+    lines = list(zip(rows["item"], rows["category"], rows["quantity"], rows["purchase_price"],
+                     rows["selling_price"], rows["product_id"]))
+
+    def apply(tx):
+        now = datetime.now()
+        created = {}  # emri i normalizuar -> id, që dy rreshta të një produkti të ri s'krijojnë dy produkte
+        supplies = []
+        for item, category, quantity, purchase_price, selling_price, product_id in lines:
+            key = normalize_name(item)
+            product_id = created.get(key) if pd.isna(product_id) else product_id
+            quantity = int(quantity) if float(quantity).is_integer() else float(quantity)
+            new_supply, product = _receive(tx, now, supplier, item, category, quantity,
+                                           float(purchase_price), float(selling_price), product_id)
+            created.setdefault(key, product['id'])
+            supplies.append(new_supply)
+        return supplies
+
+    return run_transaction(apply)
@@ -0,0 +1,236 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+# --- BENCHMARK I LOGJIKËS SË FAQEVE ---
+# python -m tools.benchmark --products 2000 --years 3 --out bench.json
+# python -m tools.benchmark --data /tmp/agro --baseline bench.json
+# Mat pjesën e të dhënave të çdo faqeje pa Streamlit (Dashboard, Inventari,
+# Borxhet, Raportet, konteksti i AI, POS) dhe i shkruan rezultatet në JSON,
+# që regresionet të duken duke krahasuar dy versione.
+
+QUERIES = ["", "fara", "npk 25kg", "koncentrat lop", "herbcid", "zorre uji pro"]
+QUESTIONS = ["Cilat produkte po mbarojnë?", "Kush ka borxhe të vonuara?", "Si shkon marzhi sipas kategorive?"]
+# Rritje mbi këtë përqindje ndaj baseline-it shënohet si regres
+REGRESSION = 0.20
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def timed(fn, repeat):
+    # Thirrja e parë (cache të ftohta) mbahet veçmas nga të tjerat
+    samples = []
+    for _ in range(repeat + 1):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    first, rest = samples[0], sorted(samples[1:]) or samples[:1]
+    return {
+        "runs": len(rest),
+        "first_ms": round(first, 3),
+        "min_ms": round(rest[0], 3),
+        "median_ms": round(statistics.median(rest), 3),
+        "p95_ms": round(rest[min(len(rest) - 1, int(len(rest) * 0.95))], 3),
+        "mean_ms": round(statistics.fmean(rest), 3),
+    }
+
+
+def cases():
+    # Importohen pasi AGROLINDI_DATA_DIR të jetë vendosur
+    import pandas as pd
+
+    from agrolindi.analytics import get_snapshot
+    from agrolindi.charts import WINDOWS, clear as clear_charts, sales_chart, top_products_chart
+    from agrolindi.context import context_builder
+    from agrolindi.debts import FILTERS, get_ledger
+    from agrolindi.forecast import refresh, reorder_list
+    from agrolindi.inventory import update_stock_fifo
+    from agrolindi.periods import month_range, sales_between, supplies_between
+    from agrolindi.products import get_repository
+    from agrolindi.rollups import get_rollups
+    from agrolindi.sales import calculate_profit, checkout
+    from agrolindi.search import get_search_index
+
+    def dashboard():
+        len(get_repository())
+        by_payment = get_rollups("payment")
+        sum(r['revenue'] for r in by_payment), sum(r['orders'] for r in by_payment)
+        reorder_list()
+        sales_chart("7 ditë")
+        top_products_chart(5)
+
+    def charts_cold():
+        # Figurat rindërtohen për çdo dritare (si pas një shitjeje të re)
+        clear_charts()
+        for window in WINDOWS:
+            sales_chart(window)
+        top_products_chart(5)
+
+    def inventari():
+        repo = get_repository()
+        index = get_search_index()
+        for q in QUERIES:
+            ids, _ = index.search(q, page_size=50)
+            pd.DataFrame([repo.get(pid) for pid in ids], columns=['name', 'category', 'price', 'purchasePrice', 'stock'])
+
+    def borxhet():
+        ledger = get_ledger()
+        for filter_type in FILTERS:
+            page, _ = ledger.query(filter_type, "", page_size=20)
+            for debt in page:
+                ledger.status(debt['id'])
+        ledger.query("Të Gjitha", "krasniqi", page_size=20)
+
+    def raportet():
+        start, end = month_range(date.today())
+        period_sales = sales_between(start, end)
+        period_supplies = supplies_between(start, end)
+        sum(s['total'] for s in period_sales)
+        sum(s['purchasePrice'] * s['quantity'] for s in period_supplies)
+        get_snapshot().summary(start, end)
+        for sale in period_sales:
+            calculate_profit(sale['items'])
+        get_snapshot().category_mix(start, end)
+
+    def ai_context():
+        for q in QUESTIONS:
+            context_builder.build(q)
+
+    def forecast_refresh():
+        # Puna e fijes në sfond, një rifreskim i plotë
+        refresh()
+
+    def ai_context_cold():
+        # Seksionet rillogariten nga e para (si pas një ndryshimi të të dhënave)
+        context_builder._sections.clear()
+        context_builder.build(QUESTIONS[0])
+
+    def pos_cart():
+        # Tre produktet me stokun më të madh, që shitja të mos dështojë
+        repo = get_repository()
+        return [{"product_id": p['id'], "name": p['name'], "price": p['price'], "quantity": 1, "total": p['price']}
+                for p in sorted(repo, key=lambda p: -p['stock'])[:3]]
+
+    cart = []
+
+    def pos_checkout():
+        if not cart:
+            cart.extend(pos_cart())
+        checkout(cart)
+
+    def pos_update_stock_fifo():
+        if not cart:
+            cart.extend(pos_cart())
+        update_stock_fifo(cart[0]['product_id'], 1)
+
+    # Rastet që vetëm lexojnë para atyre që shkruajnë
+    return {
+        "dashboard": dashboard,
+        "charts_cold": charts_cold,
+        "inventari_search": inventari,
+        "borxhet_prep": borxhet,
+        "raportet_month": raportet,
+        "ai_context": ai_context,
+        "ai_context_cold": ai_context_cold,
+        "forecast_refresh": forecast_refresh,
+        "pos_checkout": pos_checkout,
+        "pos_update_stock_fifo": pos_update_stock_fifo,
+    }
+
+
+def compare(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)["cases"]
+    regressions = []
+    print(f"\n{'rasti':24} {'baseline':>10} {'tani':>10} {'ndryshim':>9}")
+    for name, stats in results.items():
+        old = baseline.get(name)
+        if not old:
+            continue
+        change = stats["median_ms"] / old["median_ms"] - 1 if old["median_ms"] else 0.0
+        flag = "  REGRES" if change > REGRESSION else ""
+        print(f"{name:24} {old['median_ms']:10.2f} {stats['median_ms']:10.2f} {change * 100:+8.0f}%{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data", help="dosje e gjeneruar me tools.generate_data (kopjohet, s'preket)")
+    parser.add_argument("--products", type=int, default=500)
+    parser.add_argument("--years", type=float, default=2)
+    parser.add_argument("--sales-per-day", type=int, default=40)
+    parser.add_argument("--debts", type=int, default=400)
+    parser.add_argument("--backend", choices=["sqlite", "json"], default="sqlite")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="*", help="vetëm këto raste")
+    parser.add_argument("--out", default="benchmark-results.json")
+    parser.add_argument("--baseline", help="rezultate të mëparshme për krahasim")
+    args = parser.parse_args()
+
+    work = tempfile.mkdtemp(prefix="agrolindi_bench_")
+    data_dir = os.path.join(work, "data")
+    if args.data:
+        shutil.copytree(args.data, data_dir)
+        backend = "sqlite" if os.path.exists(os.path.join(data_dir, "agrolindi.db")) else "json"
+    else:
+        backend = args.backend
+    os.environ["AGROLINDI_DATA_DIR"] = data_dir
+    os.environ["AGROLINDI_STORAGE"] = backend
+
+    try:
+        if not args.data:
+            from tools.generate_data import generate, write
+            started = time.perf_counter()
+            write(generate(args.products, args.years, args.sales_per_day, args.debts), data_dir, backend)
+            print(f"të dhënat u gjeneruan në {time.perf_counter() - started:.1f}s")
+
+        from agrolindi.storage import load_data
+        dataset = {key: len(load_data(key, [])) for key in ("products", "sales", "supplies", "debts")}
+        print(f"{backend}: {dataset}")
+
+        results = {}
+        for name, fn in cases().items():
+            if args.only and name not in args.only:
+                continue
+            results[name] = stats = timed(fn, args.repeat)
+            print(f"{name:24} e para {stats['first_ms']:9.2f} ms   mediana {stats['median_ms']:9.2f} ms   "
+                  f"p95 {stats['p95_ms']:9.2f} ms")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "backend": backend,
+        "dataset": dataset,
+        "repeat": args.repeat,
+        "cases": results,
+    }
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"rezultatet -> {args.out}")
+
+    if args.baseline and compare(results, args.baseline):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from agrolindi import storage
+from agrolindi.inventory import add_batch, apply_fifo
+from agrolindi.rollups import rebuild_rollups
+
+# --- GJENERATORI I TË DHËNAVE SINTETIKE ---
+# python -m tools.generate_data --out /tmp/agro --products 2000 --years 3
+# Simulon dyqanin ditë pas dite: furnizime me batch, shitje me shumë rreshta
+# (FIFO e vërtetë, pra COGS i saktë), borxhe me pagesa e marrëveshje.
+# Rezultati shkruhet me backend-in e zgjedhur, njësoj si të dhënat reale.
+
+CATEGORIES = {
+    "Fara": (["Fara Misri", "Fara Gruri", "Fara Domateje", "Fara Specash", "Fara Kastraveci", "Fara Jonxhe"],
+             ["1kg", "5kg", "25kg", "100g"], (1.0, 40.0)),
+    "Plehra": (["Pleh NPK 15-15-15", "Ure 46%", "Nitrat Amoni", "Superfosfat", "Pleh Organik"],
+               ["10kg", "25kg", "50kg"], (8.0, 45.0)),
+    "Pesticide": (["Herbicid", "Fungicid", "Insekticid", "Akaricid"], ["100ml", "250ml", "1L", "5L"], (4.0, 60.0)),
+    "Koncentrat": (["Koncentrat Lopësh", "Koncentrat Pulash", "Koncentrat Derrash", "Krunde"],
+                   ["25kg", "40kg", "50kg"], (12.0, 30.0)),
+    "Vegla": (["Lopatë", "Kazmë", "Gërshërë Krasitjeje", "Zorrë Uji", "Spërkatës", "Sëpatë"],
+              ["", "Pro", "Mini"], (3.0, 80.0)),
+}
+BRANDS = ["Agro", "Kosova", "Green", "Terra", "Fito", "Dardania", "Prima", "Alba"]
+SUPPLIERS = ["Agrokos SH.P.K.", "Fidani Trade", "Bujqësia Sot", "Terra Import", "Vita Agro"]
+FIRST = ["Agron", "Besnik", "Drita", "Flora", "Gëzim", "Ilir", "Jeton", "Lirie", "Mentor", "Naim", "Shpresa", "Valon"]
+LAST = ["Krasniqi", "Gashi", "Berisha", "Morina", "Hoxha", "Shala", "Bytyqi", "Kelmendi", "Hoti", "Rexhepi"]
+# Sezonaliteti mujor i shitjeve (pranvera është sezoni i lartë)
+SEASON = [0.6, 0.7, 1.3, 1.6, 1.5, 1.1, 0.9, 0.8, 1.0, 1.1, 0.8, 0.6]
+
+
+def ean13(n):
+    # Barkod EAN-13 me prefiks për përdorim të brendshëm (2xx) dhe shifër kontrolli
+    digits = f"200{n:09d}"
+    check = (10 - sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(digits)) % 10) % 10
+    return digits + str(check)
+
+
+def make_products(rnd, count):
+    products = []
+    names = set()
+    while len(products) < count:
+        category = rnd.choice(list(CATEGORIES))
+        bases, sizes, (low, high) = CATEGORIES[category]
+        name = " ".join(x for x in (rnd.choice(bases), rnd.choice(BRANDS), rnd.choice(sizes)) if x)
+        if name in names:
+            name = f"{name} {len(products)}"
+        names.add(name)
+        cost = round(rnd.uniform(low, high), 2)
+        products.append({
+            "id": f"p{len(products):06d}",
+            "name": name,
+            "barcode": ean13(len(products)),
+            "category": category,
+            "price": round(cost * rnd.uniform(1.2, 1.6), 2),
+            "purchasePrice": cost,
+            "stock": 0,
+            "description": f"{category} - {rnd.choice(BRANDS)}",
+            "batches": [],
+        })
+    return products
+
+
+def generate(products=500, years=2, sales_per_day=40, debts=400, seed=42, end=None):
+    # Kthen koleksionet si fjalor; shkrimi në disk bëhet nga write()
+    rnd = random.Random(seed)
+    end = end or datetime.now().replace(microsecond=0)
+    start = end - timedelta(days=int(365 * years))
+    catalog = make_products(rnd, products)
+    # Popullariteti sipas ligjit Zipf: pak produkte shiten shumë
+    weights = [1.0 / (i + 1) ** 0.8 for i in range(len(catalog))]
+    rnd.shuffle(weights)
+    supplies = []
+    sales = []
+    debt_rows = []
+    debt_chance = debts / max(1, sales_per_day * 365 * years)
+    counter = [0]
+
+    def next_id(prefix):
+        counter[0] += 1
+        return f"{prefix}{counter[0]:08d}"
+
+    def receive(p, when, quantity):
+        cost = round(p['purchasePrice'] * rnd.uniform(0.9, 1.1), 2)
+        supplies.append({
+            "id": next_id("s"), "date": when.isoformat(), "supplier": rnd.choice(SUPPLIERS),
+            "itemName": p['name'], "category": p['category'], "purchasePrice": cost,
+            "sellingPrice": p['price'], "quantity": quantity,
+        })
+        add_batch(p, {"id": next_id("batch_"), "date": when.isoformat(), "quantity": quantity, "cost": cost})
+        p['stock'] += quantity
+        p['purchasePrice'] = cost
+
+    for p in catalog:
+        receive(p, start, rnd.randint(20, 200))
+
+    day = start
+    while day < end:
+        opening = day.replace(hour=7, minute=0, second=0)
+        count = max(0, int(rnd.gauss(sales_per_day * SEASON[day.month - 1], sales_per_day * 0.2)))
+        times = sorted(rnd.randint(0, 12 * 3600) for _ in range(count))
+        for offset in times:
+            when = opening + timedelta(seconds=offset)
+            lines = []
+            chosen = set()
+            for p in rnd.choices(catalog, weights, k=rnd.choice([1, 1, 2, 2, 3, 4, 6])):
+                if p['id'] in chosen:
+                    continue
+                chosen.add(p['id'])
+                quantity = rnd.choice([1, 1, 1, 2, 3, 5, 10])
+                if p['stock'] < quantity:
+                    # Rifurnizim i vonuar: malli hyn para shitjes
+                    receive(p, when - timedelta(minutes=30), rnd.randint(50, 300))
+                cost, consumed = apply_fifo(p, quantity)
+                lines.append({"product_id": p['id'], "name": p['name'], "price": p['price'],
+                              "quantity": quantity, "total": round(p['price'] * quantity, 2),
+                              "cost": round(cost, 2), "batches": consumed})
+            total = round(sum(line['total'] for line in lines), 2)
+            is_debt = rnd.random() < debt_chance
+            sales.append({"id": next_id("t"), "date": when.isoformat(), "items": lines, "total": total,
+                          "cogs": round(sum(line['cost'] for line in lines), 2),
+                          "type": "debt" if is_debt else "cash"})
+            if is_debt:
+                debt_rows.append(make_debt(rnd, next_id("d"), when, end, total, lines))
+        day += timedelta(days=1)
+
+    categories = [{"name": name, "icon": ""} for name in CATEGORIES]
+    return {"products": catalog, "sales": sales, "supplies": supplies, "debts": debt_rows, "categories": categories}
+
+
+def make_debt(rnd, debt_id, when, end, amount, lines):
+    has_agreement = rnd.random() < 0.3
+    due = when + timedelta(days=rnd.choice([15, 30, 60, 90])) if has_agreement or rnd.random() < 0.5 else None
+    debt = {
+        "id": debt_id,
+        "personName": f"{rnd.choice(FIRST)} {rnd.choice(LAST)}",
+        "amount": amount,
+        "dateTaken": when.isoformat(),
+        "description": ", ".join(f"{line['quantity']}x {line['name']}" for line in lines),
+        "isPaid": False,
+        "hasAgreement": has_agreement,
+        "paymentDueDate": due.isoformat() if due else None,
+        "history": [],
+    }
+    # Borxhet e vjetra kanë më shumë gjasa të jenë paguar (plotësisht ose pjesërisht)
+    age = (end - when).days
+    paid_chance = min(0.95, age / 120)
+    pay_day = when
+    while debt['amount'] > 0 and rnd.random() < paid_chance:
+        pay_day += timedelta(days=rnd.randint(5, 40))
+        if pay_day >= end:
+            break
+        amount = round(min(debt['amount'], debt['amount'] * rnd.choice([0.3, 0.5, 1.0])), 2)
+        debt['amount'] = round(debt['amount'] - amount, 2)
+        entry = f"[{pay_day.strftime('%Y-%m-%d')}] Paguar: {amount}€, Mbetja: {debt['amount']}€"
+        debt['history'].append(entry)
+        debt['description'] += f"\n{entry}"
+    if debt['amount'] <= 0.01:
+        debt['amount'] = 0
+        debt['isPaid'] = True
+    return debt
+
+
+def write(data, data_dir, backend="sqlite"):
+    os.makedirs(data_dir, exist_ok=True)
+    if backend == "json":
+        storage.set_backend(storage.JsonBackend(data_dir))
+    else:
+        storage.set_backend(storage.SqliteBackend(data_dir=data_dir))
+    for key in ("categories", "products", "supplies", "sales", "debts"):
+        storage.save_data(key, data[key])
+    rebuild_rollups(data["sales"], data["products"])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--out", required=True, help="dosja e të dhënave (p.sh. /tmp/agro)")
+    parser.add_argument("--backend", choices=["sqlite", "json"], default="sqlite")
+    parser.add_argument("--products", type=int, default=500)
+    parser.add_argument("--years", type=float, default=2)
+    parser.add_argument("--sales-per-day", type=int, default=40)
+    parser.add_argument("--debts", type=int, default=400, help="numri i përafërt i borxheve")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--force", action="store_true", help="mbishkruaj një dosje që ka të dhëna")
+    args = parser.parse_args()
+
+    if os.path.isdir(args.out) and os.listdir(args.out) and not args.force:
+        sys.exit(f"{args.out} nuk është bosh; përdorni --force për ta mbishkruar")
+    started = time.perf_counter()
+    data = generate(args.products, args.years, args.sales_per_day, args.debts, args.seed)
+    generated = time.perf_counter() - started
+    write(data, args.out, args.backend)
+    print(f"{len(data['products'])} produkte, {len(data['sales'])} shitje, {len(data['supplies'])} furnizime, "
+          f"{len(data['debts'])} borxhe -> {args.out} ({args.backend}); "
+          f"gjenerimi {generated:.1f}s, shkrimi {time.perf_counter() - started - generated:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
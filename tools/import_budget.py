@@ -0,0 +1,97 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+# --- BUXHETI I KOHËS SË NISJES ---
+# python -m tools.import_budget
+# Çdo faqe hapet në një proces të ri Python (start i ftohtë), mbi një grup të
+# vogël të dhënash sintetike. Matet koha e importit + render-it të parë dhe
+# kontrollohet që faqja të mos ngarkojë module të rënda që nuk i duhen.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ["pandas", "numpy", "plotly.express", "google.generativeai"]
+
+# faqja -> (ms maksimum për render-in e parë, modulet që s'duhet të ngarkojë)
+BUDGETS = {
+    "views/pos.py": (800, ["pandas", "numpy", "plotly.express", "google.generativeai"]),
+    "views/borxhet.py": (800, ["pandas", "numpy", "plotly.express", "google.generativeai"]),
+    "views/furnizimet.py": (800, ["pandas", "numpy", "plotly.express", "google.generativeai"]),
+    "views/inventari.py": (1200, ["plotly.express", "google.generativeai"]),
+    "views/raportet.py": (1500, ["plotly.express", "google.generativeai"]),
+    "views/dashboard.py": (2000, ["plotly.express", "google.generativeai"]),
+    "views/asistenti.py": (1500, ["pandas", "plotly.express", "google.generativeai"]),
+}
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+ready = time.perf_counter()
+at = AppTest.from_file(sys.argv[1], default_timeout=120).run()
+done = time.perf_counter()
+print(json.dumps({
+    "streamlit_ms": (ready - started) * 1000,
+    "page_ms": (done - ready) * 1000,
+    "errors": [str(e.value) for e in at.exception],
+    "modules": [m for m in %r if m in sys.modules],
+}))
+""" % HEAVY
+
+
+def probe(page, env):
+    out = subprocess.run([sys.executable, "-c", PROBE, os.path.join(ROOT, page)], cwd=ROOT, env=env,
+                         capture_output=True, text=True)
+    if out.returncode != 0:
+        return {"errors": [out.stderr.strip().splitlines()[-1] if out.stderr.strip() else "dështoi"],
+                "modules": [], "page_ms": 0.0, "streamlit_ms": 0.0}
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data", help="dosje të dhënash (përndryshe gjenerohet një e vogël)")
+    parser.add_argument("--out", help="shkruaj rezultatet në JSON")
+    args = parser.parse_args()
+
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    with tempfile.TemporaryDirectory(prefix="agrolindi_budget_") as work:
+        if args.data:
+            env["AGROLINDI_DATA_DIR"] = args.data
+        else:
+            env["AGROLINDI_DATA_DIR"] = os.path.join(work, "data")
+            subprocess.run([sys.executable, "-m", "tools.generate_data", "--out", env["AGROLINDI_DATA_DIR"],
+                            "--products", "300", "--years", "1", "--sales-per-day", "20"],
+                           cwd=ROOT, env=env, check=True, capture_output=True)
+            # Snapshot-i i analitikës ndërtohet një herë, si në një instalim që punon
+            subprocess.run([sys.executable, "-m", "agrolindi.analytics"], cwd=ROOT, env=env, check=True,
+                           capture_output=True)
+
+        results = {}
+        failed = []
+        print(f"{'faqja':22} {'streamlit':>10} {'faqja':>9} {'buxheti':>8}  module të rënda")
+        for page, (budget, forbidden) in BUDGETS.items():
+            r = results[page] = probe(page, env)
+            problems = list(r["errors"])
+            if r["page_ms"] > budget:
+                problems.append(f"{r['page_ms']:.0f} ms > {budget} ms")
+            problems += [f"ngarkoi {m}" for m in r["modules"] if m in forbidden]
+            r["budget_ms"] = budget
+            r["ok"] = not problems
+            print(f"{page:22} {r['streamlit_ms']:8.0f}ms {r['page_ms']:7.0f}ms {budget:6d}ms  "
+                  f"{', '.join(r['modules']) or '-'}{'  <- ' + '; '.join(problems) if problems else ''}")
+            if problems:
+                failed.append(page)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+    if failed:
+        sys.exit(1)
+    print("OK: të gjitha faqet brenda buxhetit")
+
+
+if __name__ == "__main__":
+    main()
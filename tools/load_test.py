@@ -0,0 +1,177 @@
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlparse
+
+from agrolindi import storage
+from tools.generate_data import ean13
+
+# --- TEST NGARKESE I API-SË ---
+# python -m tools.load_test --clients 8 --duration 10
+# python -m tools.load_test --url http://127.0.0.1:8765 --batch 10
+# Pa --url nis një instancë lokale (proces më vete) mbi një katalog me stok të
+# bollshëm. Çdo klient simulon një arkë me skaner: lexon barkodet e artikujve
+# (GET /barcode) dhe dërgon shportën (POST /sales ose /sales/batch). Në fund
+# raportohen shitjet në sekondë dhe vonesat p50/p95/p99 sipas kërkesës.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(samples, q):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def prepare(data_dir, backend, products, stock):
+    # Katalog me barkode dhe stok të madh, që shitjet të mos dështojnë
+    os.makedirs(data_dir, exist_ok=True)
+    if backend == "json":
+        storage.set_backend(storage.JsonBackend(data_dir))
+    else:
+        storage.set_backend(storage.SqliteBackend(data_dir=data_dir))
+    storage.save_data("products", [{
+        "id": f"p{i}", "name": f"Produkt {i}", "barcode": ean13(i), "category": f"Kat {i % 5}",
+        "price": 2.5, "purchasePrice": 1.0, "stock": stock, "description": "",
+        "batches": [{"id": f"b{i}", "date": "2020-01-01T00:00:00", "quantity": stock, "cost": 1.0}],
+    } for i in range(products)])
+    return dict(os.environ, AGROLINDI_DATA_DIR=data_dir, AGROLINDI_STORAGE=backend, PYTHONPATH=ROOT)
+
+
+def start_server(env):
+    proc = subprocess.Popen([sys.executable, "-m", "agrolindi.api", "--port", "0"], cwd=ROOT, env=env,
+                            stdout=subprocess.PIPE, text=True)
+    line = proc.stdout.readline()
+    if not line:
+        proc.kill()
+        sys.exit("API-ja nuk u nis")
+    return proc, line.strip().split()[-1]
+
+
+def client(url, seed, args, deadline, stats, lock):
+    rnd = random.Random(seed)
+    target = urlparse(url)
+    conn = http.client.HTTPConnection(target.hostname, target.port, timeout=30)
+    headers = {"Content-Type": "application/json"}
+    if os.environ.get("AGROLINDI_API_TOKEN"):
+        headers["Authorization"] = f"Bearer {os.environ['AGROLINDI_API_TOKEN']}"
+    local = {"lookup": [], "sale": [], "sold": 0, "rejected": 0, "errors": 0}
+
+    def call(kind, method, path, body=None):
+        started = time.perf_counter()
+        conn.request(method, path, body=json.dumps(body) if body is not None else None, headers=headers)
+        response = conn.getresponse()
+        payload = json.loads(response.read() or b"{}")
+        local[kind].append((time.perf_counter() - started) * 1000)
+        return response.status, payload
+
+    while time.perf_counter() < deadline:
+        carts = []
+        for _ in range(args.batch):
+            items = []
+            for _ in range(rnd.randint(1, 4)):
+                code = ean13(rnd.randrange(args.products))
+                if args.lookups:
+                    status, _ = call("lookup", "GET", f"/barcode/{code}")
+                    if status != 200:
+                        local["errors"] += 1
+                items.append({"barcode": code, "quantity": rnd.randint(1, 3)})
+            carts.append({"items": items})
+        if args.batch == 1:
+            status, payload = call("sale", "POST", "/sales", carts[0])
+            if status == 200:
+                local["sold"] += 1
+            elif status == 422:
+                local["rejected"] += 1
+            else:
+                local["errors"] += 1
+        else:
+            status, payload = call("sale", "POST", "/sales/batch", {"carts": carts})
+            if status == 200:
+                local["sold"] += payload["sold"]
+                local["rejected"] += len(carts) - payload["sold"]
+            else:
+                local["errors"] += 1
+    conn.close()
+    with lock:
+        for key, value in local.items():
+            stats[key] += value
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="instancë ekzistuese (përndryshe niset një lokale)")
+    parser.add_argument("--backend", choices=["sqlite", "json"], default="sqlite")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0, help="sekonda")
+    parser.add_argument("--batch", type=int, default=1, help="shporta për kërkesë (>1 = /sales/batch)")
+    parser.add_argument("--products", type=int, default=200)
+    parser.add_argument("--stock", type=int, default=1000000)
+    parser.add_argument("--no-lookups", dest="lookups", action="store_false", help="pa GET /barcode për artikull")
+    parser.add_argument("--out", help="shkruaj rezultatet në JSON")
+    args = parser.parse_args()
+
+    proc = None
+    work = None
+    url = args.url
+    if not url:
+        work = tempfile.TemporaryDirectory(prefix="agrolindi_load_")
+        proc, url = start_server(prepare(os.path.join(work.name, "data"), args.backend, args.products, args.stock))
+    try:
+        stats = {"lookup": [], "sale": [], "sold": 0, "rejected": 0, "errors": 0}
+        lock = threading.Lock()
+        started = time.perf_counter()
+        deadline = started + args.duration
+        threads = [threading.Thread(target=client, args=(url, i, args, deadline, stats, lock))
+                   for i in range(args.clients)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - started
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait()
+        if work:
+            work.cleanup()
+
+    report = {
+        "url": url,
+        "backend": None if args.url else args.backend,
+        "clients": args.clients,
+        "batch": args.batch,
+        "seconds": round(elapsed, 2),
+        "sold": stats["sold"],
+        "rejected": stats["rejected"],
+        "errors": stats["errors"],
+        "sales_per_second": round(stats["sold"] / elapsed, 1),
+    }
+    print(f"{url} · {args.clients} klientë · {args.batch} shporta/kërkesë · {elapsed:.1f}s")
+    print(f"shitje: {stats['sold']} ({report['sales_per_second']}/s), refuzuar {stats['rejected']}, "
+          f"gabime {stats['errors']}")
+    for kind in ("lookup", "sale"):
+        samples = stats[kind]
+        if not samples:
+            continue
+        report[kind] = {"requests": len(samples), **{f"p{int(q * 100)}_ms": round(percentile(samples, q), 2)
+                                                      for q in (0.5, 0.95, 0.99)}}
+        print(f"{kind:7} {len(samples):7d} kërkesa   p50 {report[kind]['p50_ms']:7.2f} ms   "
+              f"p95 {report[kind]['p95_ms']:7.2f} ms   p99 {report[kind]['p99_ms']:7.2f} ms")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    if stats["errors"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+import argparse
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+from agrolindi import storage
+from agrolindi.rollups import get_rollups
+from agrolindi.sales import checkout
+from agrolindi.supplies import add_supply
+
+# --- TEST STRESI: SHUMË ARKA NJËKOHËSISHT ---
+# python -m tools.stress_checkout --threads 16 --sales 200 --backend sqlite
+# Disa fije bëjnë checkout, një tjetër regjistron furnizime në të njëjtën
+# kohë; në fund kontrollohet që stoku, batch-et dhe shitjet përputhen.
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backend", choices=["sqlite", "json"], default="sqlite")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--sales", type=int, default=100, help="shitje për fije")
+    parser.add_argument("--products", type=int, default=10)
+    parser.add_argument("--stock", type=int, default=300)
+    parser.add_argument("--keep", action="store_true", help="mos e fshi dosjen e të dhënave")
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix="agrolindi_stress_")
+    if args.backend == "json":
+        storage.set_backend(storage.JsonBackend(data_dir))
+    else:
+        storage.set_backend(storage.SqliteBackend(data_dir=data_dir))
+
+    products = [{
+        "id": f"p{i}", "name": f"Produkt {i}", "category": f"Kat {i % 3}",
+        "price": 2.5, "purchasePrice": 1.0, "stock": args.stock, "description": "",
+        "batches": [{"id": f"b{i}", "date": "2020-01-01T00:00:00", "quantity": args.stock, "cost": 1.0}],
+    } for i in range(args.products)]
+    storage.save_data("products", products)
+
+    sold = {}
+    supplied = {}
+    totals = []
+    errors = []
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def till(seed):
+        rnd = random.Random(seed)
+        for _ in range(args.sales):
+            cart = []
+            for _ in range(rnd.randint(1, 4)):
+                p = rnd.choice(products)
+                qty = rnd.randint(1, 3)
+                cart.append({"product_id": p['id'], "name": p['name'], "price": 2.5, "quantity": qty, "total": qty * 2.5})
+            try:
+                sale = checkout(cart)
+            except ValueError:
+                continue  # stok i pamjaftueshëm: e pritshme
+            except Exception as e:
+                with lock:
+                    errors.append(repr(e))
+                continue
+            with lock:
+                totals.append(sale['total'])
+                for item in cart:
+                    sold[item['product_id']] = sold.get(item['product_id'], 0) + item['quantity']
+
+    def back_office():
+        rnd = random.Random(-1)
+        while not stop.is_set():
+            p = rnd.choice(products)
+            try:
+                add_supply("Furnitori", p['name'], p['category'], 5, 1.2, 2.5)
+            except Exception as e:
+                with lock:
+                    errors.append(repr(e))
+                continue
+            with lock:
+                supplied[p['id']] = supplied.get(p['id'], 0) + 5
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=till, args=(i,)) for i in range(args.threads)]
+    office = threading.Thread(target=back_office)
+    office.start()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stop.set()
+    office.join()
+    elapsed = time.perf_counter() - started
+
+    # --- Kontrollet e konsistencës ---
+    problems = list(errors)
+    final = {p['id']: p for p in storage.load_data("products")}
+    for p in products:
+        expected = args.stock - sold.get(p['id'], 0) + supplied.get(p['id'], 0)
+        got = final[p['id']]
+        if got['stock'] != expected:
+            problems.append(f"{p['id']}: stoku {got['stock']} != {expected}")
+        in_batches = sum(b['quantity'] for b in got['batches'])
+        if in_batches != got['stock']:
+            problems.append(f"{p['id']}: batch-et {in_batches} != stoku {got['stock']}")
+    sales = storage.load_data("sales")
+    if len(sales) != len(totals):
+        problems.append(f"shitje {len(sales)} != {len(totals)} të suksesshme")
+    if abs(sum(s['total'] for s in sales) - sum(totals)) > 1e-6:
+        problems.append("totali i shitjeve nuk përputhet")
+    rolled = sum(r['revenue'] for r in get_rollups("payment"))
+    if abs(rolled - sum(totals)) > 1e-6:
+        problems.append(f"rollups {rolled} != {sum(totals)}")
+    supplies = storage.load_data("supplies", [])
+    if len(supplies) != sum(supplied.values()) // 5:
+        problems.append("numri i furnizimeve nuk përputhet")
+
+    print(f"{args.backend}: {len(totals)} shitje + {len(supplies)} furnizime në {elapsed:.2f}s "
+          f"({len(totals) / elapsed:.0f} shitje/s)")
+    if args.keep:
+        print("Të dhënat:", data_dir)
+    else:
+        shutil.rmtree(data_dir, ignore_errors=True)
+    for p in problems:
+        print("GABIM:", p)
+    if problems:
+        sys.exit(1)
+    print("OK: stoku dhe shitjet janë konsistente")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import os
+
+import streamlit as st
+
+from agrolindi.assistant import make_assistant, build_context, data_version
+
+
+@st.cache_resource(show_spinner=False)
+def load_assistant(api_key, offline):
+    # Një asistent (dhe një GenerativeModel) për çdo çelës API, i përbashkët për sesionet
+    return make_assistant(api_key, offline=offline)
+
+
+# 7. ASISTENTI AI
+st.title("🤖 Asistenti Inteligjent (Gemini)")
+
+# API Key Setup
+api_key = st.text_input("Shkruani Google Gemini API Key", type="password")
+offline = st.toggle("Modeli lokal (pa internet, për prova)", value=os.environ.get("AGROLINDI_AI_BACKEND") == "stub")
+
+if api_key or offline:
+    # Modeli ripërdoret mes rerun-eve dhe sesioneve
+    assistant = load_assistant(api_key, offline)
+
+    if "messages" not in st.session_state:
+        st.session_state.messages = []
+
+    for message in st.session_state.messages:
+        with st.chat_message(message["role"]):
+            st.markdown(message["content"])
+
+    if prompt := st.chat_input("Pyet diçka (psh: Cilat produkte po mbarojnë?)"):
+        st.session_state.messages.append({"role": "user", "content": prompt})
+        with st.chat_message("user"):
+            st.markdown(prompt)
+
+        try:
+            # Konteksti: faktet më të lidhura me pyetjen, brenda një buxheti fiks tokenësh
+            context = build_context(prompt)
+            # Përgjigjja shfaqet copë-copë ndërsa vjen; pyetjet e përsëritura vijnë nga cache
+            with st.chat_message("assistant"):
+                answer = st.write_stream(assistant.ask(prompt, context, data_version()))
+            st.session_state.messages.append({"role": "assistant", "content": answer})
+        except Exception as e:
+            st.error(f"Gabim me AI: {e}")
+else:
+    st.warning("Ju lutem vendosni API Key për të vazhduar.")
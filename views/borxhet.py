@@ -0,0 +1,55 @@
+import streamlit as st
+
+from agrolindi.debts import record_payment, get_ledger, FILTERS as DEBT_FILTERS
+
+# 5. BORXHET
+st.title("📒 Libri i Borxhlive")
+
+ledger = get_ledger()
+if not ledger.by_id:
+    st.info("Nuk ka borxhlinj.")
+else:
+    # Filter Logic
+    c_filter, c_search = st.columns([3, 2])
+    filter_type = c_filter.radio("Filtro:", DEBT_FILTERS, horizontal=True)
+    name_search = c_search.text_input("Kërko klientin", "")
+
+    page_size = 20
+    display_debts, found = ledger.query(filter_type, name_search, page_size=page_size)
+    pages = max(1, -(-found // page_size))
+    if pages > 1:
+        page = st.number_input(f"Faqja (nga {pages}) · {found} borxhe", min_value=1, max_value=pages, value=1)
+        if page > 1:
+            display_debts, _ = ledger.query(filter_type, name_search, page=page - 1, page_size=page_size)
+    if ledger.overdue:
+        st.caption(f"🔴 {len(ledger.overdue)} borxhe të vonuara")
+
+    for debt in display_debts:
+        # Card UI
+        with st.container():
+            col1, col2, col3 = st.columns([3, 2, 2])
+
+            # Vonesa e llogaritur një herë në ditë nga libri i borxheve
+            is_overdue, days_overdue = ledger.status(debt['id'])
+
+            bg_color = "🔴" if is_overdue else ("🟣" if debt.get('hasAgreement') else "🔵")
+
+            with col1:
+                st.subheader(f"{bg_color} {debt['personName']}")
+                st.caption(f"Data: {debt['dateTaken'][:10]}")
+                if is_overdue:
+                    st.error(f"⚠️ Vonesë: {days_overdue} ditë!")
+
+            with col2:
+                st.metric("Borxhi Mbetur", f"{debt['amount']:.2f} €")
+
+            with col3:
+                # Partial Payment Form
+                with st.expander("Paguaj"):
+                    pay_amt = st.number_input(f"Shuma për {debt['personName']}", min_value=0.0, max_value=float(debt['amount']), key=debt['id'])
+                    if st.button("Konfirmo Pagesën", key=f"btn_{debt['id']}"):
+                        if pay_amt > 0:
+                            record_payment(debt['id'], pay_amt)
+                            st.success("Pagesa u regjistrua!")
+                            st.rerun()
+            st.divider()
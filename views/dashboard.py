@@ -0,0 +1,65 @@
+import streamlit as st
+import pandas as pd
+
+from agrolindi import metrics
+from agrolindi.products import get_repository
+from agrolindi.forecast import reorder_list
+from agrolindi.rollups import get_rollups
+from agrolindi.charts import WINDOWS, sales_chart, top_products_chart
+
+# 1. DASHBOARD
+st.title("📊 Paneli Kryesor")
+
+repo = get_repository()
+# Vetëm tabelat e parallogaritura, jo historia e plotë e shitjeve
+by_payment = get_rollups("payment")
+
+# KPIs
+total_sales = sum(r['revenue'] for r in by_payment)
+total_orders = sum(r['orders'] for r in by_payment)
+# Nga tabela e parashikimit (fija në sfond), me stokun aktual
+low_stock = reorder_list()
+
+c1, c2, c3, c4 = st.columns(4)
+c1.metric("Totali Shitjeve", f"{total_sales:,.2f} €", delta="Totale")
+c2.metric("Porosi", total_orders, delta="Fatura")
+c3.metric("Produkte në Stok", len(repo))
+c4.metric("Stok Kritik", len(low_stock), delta_color="inverse")
+
+if low_stock:
+    st.warning(f"⚠️ Kujdes! {len(low_stock)} produkte janë duke mbaruar.")
+    with st.expander("Shiko Produktet me Stok të Ulët"):
+        st.dataframe(
+            pd.DataFrame(low_stock)[['name', 'stock', 'category', 'velocity', 'daysLeft', 'reorderQty', 'supplier']],
+            column_config={
+                "name": "Emri",
+                "stock": "Stoku",
+                "category": "Kategoria",
+                "velocity": st.column_config.NumberColumn("Shitje/ditë", format="%.1f"),
+                "daysLeft": st.column_config.NumberColumn("Ditë të mbetura", format="%.0f"),
+                "reorderQty": "Për porosi",
+                "supplier": "Furnizuesi",
+            },
+            hide_index=True
+        )
+
+# Charts: figurat vijnë të gatshme nga cache-i (sipas versionit të të dhënave dhe dritares)
+col_chart1, col_chart2 = st.columns(2)
+
+with col_chart1:
+    st.subheader("Shitjet")
+    window = st.radio("Dritarja", list(WINDOWS), horizontal=True, label_visibility="collapsed")
+    fig = sales_chart(window)
+    if fig is not None:
+        with metrics.span("chart"):
+            st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("S'ka të dhëna shitjesh.")
+
+with col_chart2:
+    st.subheader("Top Produkte")
+    # Nga përmbledhjet: përfshijnë edhe periudhat e mbyllura (arkivin)
+    fig2 = top_products_chart(5)
+    if fig2 is not None:
+        with metrics.span("chart"):
+            st.plotly_chart(fig2, use_container_width=True)
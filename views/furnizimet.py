@@ -0,0 +1,51 @@
+import hashlib
+
+import streamlit as st
+
+from agrolindi.supplies import add_supply, read_delivery, match_delivery, import_delivery
+
+# 3. FURNIZIMET
+st.title("🚚 Furnizimet (Hyrje Malli)")
+
+with st.form("supply_form"):
+    col1, col2 = st.columns(2)
+    with col1:
+        s_supplier = st.text_input("Furnitori (Kompania)")
+        s_item = st.text_input("Emri Mallit")
+        s_cat = st.text_input("Kategoria")
+    with col2:
+        s_qty = st.number_input("Sasia", min_value=1)
+        s_buy_price = st.number_input("Çmimi Blerjes (€)", min_value=0.0)
+        s_sell_price = st.number_input("Çmimi Shitjes (€)", min_value=0.0)
+
+    if st.form_submit_button("Regjistro Furnizimin"):
+        add_supply(s_supplier, s_item, s_cat, s_qty, s_buy_price, s_sell_price)
+        st.success("Furnizimi u regjistrua dhe stoku u përditësua!")
+
+# Import i gjithë fletëdërgesës: parapamje, pastaj një regjistrim i vetëm
+with st.expander("📄 Importo Fletëdërgesë (CSV / Excel)"):
+    st.caption("Kolonat: Emri, Kategoria, Sasia, Çmimi Blerjes, Çmimi Shitjes")
+    b_supplier = st.text_input("Furnitori i fletëdërgesës")
+    upload = st.file_uploader("Skedari", type=["csv", "xlsx"])
+    if upload is not None:
+        data = upload.getvalue()
+        digest = hashlib.sha256(data).hexdigest()
+        try:
+            delivery = match_delivery(read_delivery(data, upload.name))
+        except ValueError as e:
+            st.error(f"Skedari nuk u lexua: {e}")
+            st.stop()
+        counts = delivery["status"].value_counts()
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Produkte ekzistuese", int(counts.get("Ekzistues", 0)))
+        c2.metric("Produkte të reja", int(counts.get("I ri", 0)))
+        c3.metric("Rreshta me gabim", int(counts.get("Gabim", 0)))
+        st.dataframe(delivery[["item", "category", "quantity", "purchase_price", "selling_price", "status", "error"]])
+        valid = int((delivery["status"] != "Gabim").sum())
+        # E njëjta fletëdërgesë s'regjistrohet dy herë (klikim i dytë, rerun)
+        if st.session_state.get("imported_delivery") == digest:
+            st.success("Kjo fletëdërgesë u regjistrua.")
+        elif st.button(f"Regjistro {valid} rreshta", disabled=valid == 0):
+            import_delivery(delivery, b_supplier)
+            st.session_state["imported_delivery"] = digest
+            st.success(f"U regjistruan {valid} rreshta furnizimi në një veprim.")
@@ -0,0 +1,89 @@
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+
+from agrolindi.storage import load_data, insert_record
+from agrolindi.products import get_repository
+from agrolindi.search import get_search_index
+from agrolindi.forecast import get_forecast, outlook
+
+# 2. INVENTARI
+st.title("📦 Inventari i Dyqanit")
+
+repo = get_repository()
+categories = load_data("categories", [{"name": "Koncentrat", "icon": "🐄"}, {"name": "Fara", "icon": "🌱"}])
+
+# Tabs
+tab1, tab2 = st.tabs(["Lista e Produkteve", "Shto Produkt / Kategori"])
+
+with tab1:
+    search = st.text_input("Kërko produkt...", "")
+
+    if len(repo):
+        # Kërkim me indeks (emër, kategori, përshkrim), me faqe
+        page_size = 50
+        ids, found = get_search_index().search(search, page_size=page_size)
+        pages = max(1, -(-found // page_size))
+        if pages > 1:
+            page = st.number_input(f"Faqja (nga {pages}) · {found} produkte", min_value=1, max_value=pages, value=1)
+            if page > 1:
+                ids, _ = get_search_index().search(search, page=page - 1, page_size=page_size)
+        df_prod = pd.DataFrame([repo.get(pid) for pid in ids], columns=['name', 'category', 'price', 'purchasePrice', 'stock', 'description'])
+        # Parashikimi vetëm për produktet e faqes
+        forecast = get_forecast()
+        outlooks = [outlook(repo.get(pid), forecast.get(pid)) for pid in ids]
+        df_prod['daysLeft'] = [days for days, _ in outlooks]
+        df_prod['reorderQty'] = [qty for _, qty in outlooks]
+
+        # Shfaqja
+        st.dataframe(
+            df_prod[['name', 'category', 'price', 'purchasePrice', 'stock', 'daysLeft', 'reorderQty', 'description']],
+            column_config={
+                "name": "Emri",
+                "category": "Kategoria",
+                "price": st.column_config.NumberColumn("Shitja (€)", format="%.2f €"),
+                "purchasePrice": st.column_config.NumberColumn("Blerja (€)", format="%.2f €"),
+                "stock": "Stoku",
+                "daysLeft": st.column_config.NumberColumn("Ditë stoku", format="%.0f"),
+                "reorderQty": "Për porosi",
+                "description": "Përshkrimi"
+            },
+            use_container_width=True,
+            hide_index=True
+        )
+    else:
+        st.info("Nuk keni produkte akoma.")
+
+with tab2:
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Shto Produkt të Ri")
+        with st.form("add_product_form"):
+            p_name = st.text_input("Emri Produktit")
+            p_barcode = st.text_input("Barkodi (opsional)")
+            p_cat = st.selectbox("Kategoria", [c['name'] for c in categories])
+            p_price = st.number_input("Çmimi Shitjes", min_value=0.0, step=0.1)
+            p_cost = st.number_input("Çmimi Blerjes (Kosto)", min_value=0.0, step=0.1)
+            p_stock = st.number_input("Stoku Fillestar", min_value=0, step=1)
+            p_desc = st.text_area("Përshkrimi")
+
+            if st.form_submit_button("Ruaj Produktin"):
+                new_prod = {
+                    "id": str(datetime.now().timestamp()),
+                    "name": p_name,
+                    "barcode": p_barcode.strip() or None,
+                    "category": p_cat,
+                    "price": p_price,
+                    "purchasePrice": p_cost,
+                    "stock": p_stock,
+                    "description": p_desc,
+                    "batches": [{
+                        "id": f"batch_{datetime.now().timestamp()}",
+                        "date": datetime.now().isoformat(),
+                        "quantity": p_stock,
+                        "cost": p_cost
+                    }]
+                }
+                insert_record("products", new_prod)
+                st.success("Produkti u shtua!")
+                st.rerun()
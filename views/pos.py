@@ -0,0 +1,97 @@
+import streamlit as st
+
+# Kasa nuk ngarkon pandas, Plotly apo Gemini: vetëm kërkimi dhe checkout-i
+from agrolindi.sales import checkout
+from agrolindi.products import get_repository
+from agrolindi.search import get_search_index
+from agrolindi.service import cart_line
+
+# 4. SHITJET (POS)
+st.title("🛒 Kasa & Shitjet")
+
+if 'cart' not in st.session_state:
+    st.session_state['cart'] = []
+
+repo = get_repository()
+
+col_prod, col_cart = st.columns([2, 1])
+
+with col_prod:
+    st.subheader("Zgjidh Produkte")
+    # Kërkim me indeks; opsionet janë id produktesh, jo etiketa tekst
+    query = st.text_input("Kërko Produktin (ose skano barkodin)", "")
+    scanned = repo.find_by_barcode(query) if query else None
+    if scanned:
+        found_ids, found = [scanned['id']], 1
+    else:
+        found_ids, found = get_search_index().search(query, page_size=50, in_stock=True)
+    if found > len(found_ids):
+        st.caption(f"Shfaqen {len(found_ids)} nga {found} produkte, shkruani më shumë për të ngushtuar.")
+    selected_id = st.selectbox(
+        "Zgjidh Produktin",
+        [""] + found_ids,
+        format_func=lambda pid: "" if not pid else f"{repo.get(pid)['name']} ({repo.get(pid)['stock']} copë) - {repo.get(pid)['price']}€",
+    )
+
+    qty = st.number_input("Sasia", min_value=1, value=1)
+
+    if st.button("Shto në Shportë"):
+        if selected_id:
+            product = repo.get(selected_id)
+
+            if qty > product['stock']:
+                st.error("Nuk ka stok të mjaftueshëm!")
+            else:
+                # Add to session cart
+                st.session_state['cart'].append(cart_line(product, qty))
+                st.success(f"{product['name']} u shtua!")
+
+with col_cart:
+    st.subheader("🧾 Shporta")
+    cart = st.session_state['cart']
+
+    if cart:
+        st.dataframe([{k: item[k] for k in ('name', 'quantity', 'total')} for item in cart], hide_index=True)
+        grand_total = sum(item['total'] for item in cart)
+        st.divider()
+        st.metric("TOTALI", f"{grand_total:.2f} €")
+
+        # DEBT OPTION
+        is_debt = st.checkbox("Shitje me Borxh?")
+        debtor_name = ""
+        is_agreement = False
+        due_date = None
+
+        if is_debt:
+            st.info("Regjistrimi i Borxhit")
+            debtor_name = st.text_input("Emri i Klientit")
+            is_agreement = st.checkbox("Me Marrëveshje?")
+            due_date = st.date_input("Data e Premtimit Pagesës")
+
+        if st.button("Përfundo Shitjen", type="primary"):
+            if is_debt and not debtor_name:
+                st.error("Shkruani emrin e klientit!")
+            else:
+                # Fatura, stoku (FIFO) dhe borxhi në një transaksion të vetëm
+                try:
+                    checkout(
+                        st.session_state['cart'],
+                        is_debt=is_debt,
+                        debtor_name=debtor_name,
+                        is_agreement=is_agreement,
+                        due_date=due_date,
+                    )
+                except ValueError as e:
+                    st.error(str(e))
+                    st.stop()
+
+                # Reset
+                st.session_state['cart'] = []
+                st.success("Shitja u krye me sukses!")
+                st.rerun()
+
+        if st.button("Pastro Shportën"):
+            st.session_state['cart'] = []
+            st.rerun()
+    else:
+        st.write("Shporta është bosh.")
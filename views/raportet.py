@@ -0,0 +1,71 @@
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+
+from agrolindi.analytics import get_snapshot
+from agrolindi.archive import closed_between
+from agrolindi.periods import day_range, week_range, month_range, custom_range, sales_between, supplies_between
+
+# 6. RAPORTET
+st.title("📈 Raportet Financiare")
+
+period_type = st.radio("Periudha", ["Dita", "Java", "Muaji", "Interval"], horizontal=True)
+if period_type == "Interval":
+    date_filter = st.date_input("Zgjidh Intervalin", (datetime.now().date().replace(day=1), datetime.now().date()))
+    if len(date_filter) < 2:
+        st.info("Zgjidhni edhe datën e fundit.")
+        st.stop()
+    start, end = custom_range(*date_filter)
+else:
+    date_filter = st.date_input("Zgjidh Datën", datetime.now())
+    start, end = {"Dita": day_range, "Java": week_range, "Muaji": month_range}[period_type](date_filter)
+
+# Filter data: lexohen vetëm regjistrimet e periudhës (indeksi i datës)
+day_sales = sales_between(start, end)
+day_supplies = supplies_between(start, end)
+
+# Periudhat e mbyllura: vetëm përmbledhjet e tyre, arkivi nuk hapet
+closed = closed_between(start, end)
+
+total_revenue = sum(s['total'] for s in day_sales) + closed['revenue']
+total_cost = sum(s['purchasePrice'] * s['quantity'] for s in day_supplies) + closed['supply_cost'] # Kjo është shpenzim blerje, jo kosto e shitjes (COGS)
+
+# Fitimi real: xhiro - COGS, nga snapshot-i kolonor i analitikës
+snapshot = get_snapshot()
+period_summary = snapshot.summary(start, end)
+profit_estimate = period_summary['profit'] + closed['revenue'] - closed['cogs']
+period_revenue = period_summary['revenue'] + closed['revenue']
+period_margin = profit_estimate / period_revenue if period_revenue else 0.0
+
+c1, c2, c3 = st.columns(3)
+c1.metric("Xhiro (Hyrje)", f"{total_revenue:.2f} €")
+c2.metric("Shpenzime Malli (Dalje)", f"{total_cost:.2f} €")
+c3.metric("Fitimi Neto (Vlerësim)", f"{profit_estimate:.2f} €", delta_color="normal")
+
+st.subheader("Sipas Kategorive")
+mix = pd.DataFrame(snapshot.category_mix(start, end))
+if closed['categories']:
+    archived = pd.DataFrame([{"category": c, "revenue": r, "cost": k, "quantity": q}
+                             for c, (r, k, q) in closed['categories'].items()])
+    mix = pd.concat([mix, archived]).groupby('category', as_index=False)[['revenue', 'cost', 'quantity']].sum()
+    mix['margin'] = (mix['revenue'] - mix['cost']) / mix['revenue'].where(mix['revenue'] != 0, 1)
+    mix = mix.sort_values('revenue', ascending=False)[['category', 'revenue', 'cost', 'margin', 'quantity']]
+if not mix.empty:
+    st.caption(f"Marzhi i periudhës: {period_margin:.1%}")
+    st.dataframe(
+        mix,
+        column_config={
+            "category": "Kategoria",
+            "revenue": st.column_config.NumberColumn("Xhiro (€)", format="%.2f €"),
+            "cost": st.column_config.NumberColumn("Kosto (€)", format="%.2f €"),
+            "margin": st.column_config.NumberColumn("Marzhi", format="percent"),
+            "quantity": "Sasia",
+        },
+        hide_index=True
+    )
+
+st.subheader("Detajet e Shitjeve")
+if closed['orders']:
+    st.caption(f"{closed['orders']} fatura të periudhave të mbyllura janë në arkiv (vetëm totalet më sipër).")
+if day_sales:
+    st.dataframe(pd.DataFrame(day_sales)[['date', 'total', 'type']])